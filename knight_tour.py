@@ -0,0 +1,1607 @@
+"""
+knight_tour.py
+Lógica do Passeio do Cavalo (Warnsdorff, Backtracking e Algoritmo Genético) sem
+nenhuma dependência de interface gráfica: pode ser importado em servidores headless
+e é usado tanto pela GUI (knight_tour_gui1.py) quanto pela linha de comando (knight_tour_cli.py).
+"""
+import csv
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+from array import array
+from functools import lru_cache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# ----------------------------
+# Configurações Globais
+# ----------------------------
+BOARD_SIZE = 8
+GA_POP = 250
+GA_GEN_LIMIT = 2000
+GA_TOURN = 3
+GA_MUT_RATE = 0.15
+GA_WORKERS = 1          # processos para avaliar a aptidão (1 = serial)
+
+# ----------------------------
+# Funções de Lógica do Passeio
+# ----------------------------
+KNIGHT_MOVES = [(2,1),(1,2),(-1,2),(-2,1),(-2,-1),(-1,-2),(1,-2),(2,-1)]
+# Tabuleiros são n x n por padrão; com h (altura) passam a ser n colunas x h linhas.
+# Os índices são sempre y * n + x, então idx_to_xy/xy_to_idx só precisam da largura.
+def inbound(x,y,n,h=None): return 0 <= x < n and 0 <= y < (n if h is None else h)
+def idx_to_xy(i,n): return (i % n, i // n)
+def xy_to_idx(x,y,n): return y * n + x
+
+# ----------------------------
+# Topologia do tabuleiro (vizinhos pré-calculados)
+# ----------------------------
+class BoardTopology:
+    """Vizinhança de cavalo pré-calculada para um tabuleiro n x h (h=None: quadrado).
+       neighbors[i]: casas alcançáveis a partir de i (na ordem de KNIGHT_MOVES);
+       degree[i]: quantidade de vizinhos. Legalidade de um lance sai da aritmética das
+       coordenadas (is_legal) ou de 'b in neighbors[a]' (tupla de até 8 casas), sem
+       um conjunto por casa."""
+    def __init__(self, n, h=None):
+        self.n = n
+        self.h = n if h is None else h
+        self.size = n * self.h
+        # casas a 2+ da borda têm os 8 vizinhos: basta somar os deslocamentos
+        offsets = tuple(dy * n + dx for dx, dy in KNIGHT_MOVES)
+        neighbors = []
+        for y in range(self.h):
+            inner = 2 <= y < self.h - 2
+            for x in range(n):
+                i = y * n + x
+                if inner and 2 <= x < n - 2:
+                    neighbors.append(tuple([i + o for o in offsets]))
+                else:
+                    neighbors.append(tuple(xy_to_idx(x+dx, y+dy, n) for dx, dy in KNIGHT_MOVES
+                                           if inbound(x+dx, y+dy, n, self.h)))
+        self.neighbors = tuple(neighbors)
+        self.degree = tuple(len(nb) for nb in neighbors)
+
+    def is_legal(self, a, b):
+        if not 0 <= b < self.size:
+            return False
+        dx = a % self.n - b % self.n; dy = a // self.n - b // self.n
+        return abs(dx) * abs(dy) == 2
+
+# Tabuleiros grandes (uma topologia de 1000x1000 ocupa centenas de MB) ficam num cache
+# separado que guarda só a última; os pequenos continuam com até 16 em cache.
+LARGE_BOARD = 250_000   # casas
+
+def get_topology(n, h=None):
+    """Topologia compartilhada (cacheada por dimensões do tabuleiro)."""
+    h = n if h is None else h
+    return (_topology if n * h <= LARGE_BOARD else _large_topology)(n, h)
+
+@lru_cache(maxsize=16)
+def _topology(n, h):
+    return BoardTopology(n, h)
+
+@lru_cache(maxsize=1)
+def _large_topology(n, h):
+    return BoardTopology(n, h)
+
+def legal_knight_move(a,b,n,h=None):
+    return get_topology(n, h).is_legal(a, b)
+def random_knight_walk(n, start_idx=0, height=None):
+    """Gera um passeio aleatório de cavalo sem repetir casas (pode não cobrir o tabuleiro todo)."""
+    neighbors = get_topology(n, height).neighbors
+    seen = set([start_idx])
+    path = [start_idx]
+    cur = start_idx
+    while True:
+        moves = [idx for idx in neighbors[cur] if idx not in seen]
+        if not moves:
+            break
+        cur = random.choice(moves)
+        path.append(cur)
+        seen.add(cur)
+    return path  # pode ter < n*h
+
+# ----------------------------
+# Simetrias do tabuleiro e codificação compacta de passeios
+# ----------------------------
+# As 8 simetrias do quadrado (x, y) -> (x', y'); em tabuleiros retangulares só valem
+# as que preservam as dimensões (identidade, rotação de 180° e os dois espelhamentos).
+SYMMETRIES = (
+    lambda x, y, w, h: (x, y),                  # identidade
+    lambda x, y, w, h: (h - 1 - y, x),          # rotação 90°
+    lambda x, y, w, h: (w - 1 - x, h - 1 - y),  # rotação 180°
+    lambda x, y, w, h: (y, w - 1 - x),          # rotação 270°
+    lambda x, y, w, h: (w - 1 - x, y),          # espelho horizontal
+    lambda x, y, w, h: (x, h - 1 - y),          # espelho vertical
+    lambda x, y, w, h: (y, x),                  # transposição
+    lambda x, y, w, h: (h - 1 - y, w - 1 - x),  # antitransposição
+)
+SYMMETRY_INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+MOVE_CODES = {mv: code for code, mv in enumerate(KNIGHT_MOVES)}
+
+def board_symmetries(w, h=None):
+    """Índices de SYMMETRIES aplicáveis a um tabuleiro w x h."""
+    return tuple(range(8)) if h is None or h == w else (0, 2, 4, 5)
+
+def transform_square(i, k, w, h=None):
+    h = w if h is None else h
+    x, y = SYMMETRIES[k](i % w, i // w, w, h)
+    return y * w + x
+
+@lru_cache(maxsize=32)
+def symmetry_map(k, w, h=None):
+    """Tabela casa -> casa da simetria k (cacheada; cada tabela tem w*h entradas)."""
+    h = w if h is None else h
+    f = SYMMETRIES[k]
+    return tuple(y2 * w + x2 for x2, y2 in (f(x, y, w, h) for y in range(h) for x in range(w)))
+
+def transform_path(path, k, w, h=None):
+    m = symmetry_map(k, w, h)
+    return [m[i] for i in path]
+
+def canonical_start(start_idx, w, h=None):
+    """Representante canônico da casa sob as simetrias do tabuleiro: (canônica, k) com
+       transform_square(start_idx, k) == canônica (a menor imagem)."""
+    return min((transform_square(start_idx, k, w, h), k) for k in board_symmetries(w, h))
+
+def start_orbits(w, h=None):
+    """Casa canônica -> [(casa, k), ...] com todas as casas da sua classe de simetria; a
+       simetria k leva a canônica à casa (transform_path(p, k) converte passeios entre elas)."""
+    orbits = {}
+    for i in range(w * (w if h is None else h)):
+        canon, k = canonical_start(i, w, h)
+        orbits.setdefault(canon, []).append((i, SYMMETRY_INVERSE[k]))
+    return orbits
+
+def canonical_starts(w, h=None):
+    """Casas que precisam ser resolvidas para cobrir o tabuleiro inteiro (~w*h/8 em tabuleiros quadrados)."""
+    return sorted(start_orbits(w, h))
+
+def symmetric_tour(tour_fn, n, start_idx, *args, height=None, **kwargs):
+    """Roda tour_fn(n, casa_canônica, ...) e leva o caminho de volta para start_idx."""
+    canon, k = canonical_start(start_idx, n, height)
+    if height is not None: kwargs['height'] = height
+    path = tour_fn(n, canon, *args, **kwargs)
+    return transform_path(path, SYMMETRY_INVERSE[k], n, height) if path else path
+
+def encode_moves(path, w):
+    """Caminho -> bytes com um código de 3 bits (índice em KNIGHT_MOVES) por salto."""
+    codes = [MOVE_CODES[(b % w - a % w, b // w - a // w)] for a, b in zip(path, path[1:])]
+    codes.extend([0] * (-len(codes) % 8))
+    out = bytearray()
+    for i in range(0, len(codes), 8):
+        c = codes[i:i+8]
+        v = c[0] | c[1] << 3 | c[2] << 6 | c[3] << 9 | c[4] << 12 | c[5] << 15 | c[6] << 18 | c[7] << 21
+        out += v.to_bytes(3, 'little')
+    return bytes(out)
+
+def iter_decode_moves(start_idx, data, count, w):
+    """Versão preguiçosa de decode_moves: gera as casas uma a uma sem montar a lista."""
+    steps = [dy * w + dx for dx, dy in KNIGHT_MOVES]
+    cur = start_idx
+    yield cur
+    for i in range(0, len(data), 3):
+        v = int.from_bytes(data[i:i+3], 'little')
+        for _ in range(min(8, count)):
+            cur += steps[v & 7]; v >>= 3
+            yield cur
+        count -= 8
+        if count <= 0: break
+
+def decode_moves(start_idx, data, count, w):
+    """Inverso de encode_moves: reconstrói os 'count' saltos a partir de start_idx."""
+    return list(iter_decode_moves(start_idx, data, count, w))
+
+def path_array(path, w, h=None):
+    """Caminho como array compacto de índices: 'H' (2 bytes/casa) até 65536 casas, senão 'I'."""
+    return array('H' if w * (w if h is None else h) <= 1 << 16 else 'I', path)
+
+class PackedTour:
+    """Passeio guardado como casa inicial + códigos de 3 bits por salto (encode_moves):
+       ~3/8 de byte por casa, contra 28+ bytes por int de uma lista. A decodificação é
+       preguiçosa (iterar não materializa a lista); to_list/path_array quando precisar de índices."""
+    __slots__ = ('w', 'h', 'start', 'count', 'data')
+
+    def __init__(self, w, h, start, count, data):
+        self.w, self.h, self.start, self.count, self.data = w, h, start, count, bytes(data)
+
+    @classmethod
+    def from_path(cls, path, w, h=None):
+        if not path: raise ValueError("Caminho vazio")
+        return cls(w, w if h is None else h, path[0], len(path) - 1, encode_moves(path, w))
+
+    def __len__(self): return self.count + 1
+    def __iter__(self): return iter_decode_moves(self.start, self.data, self.count, self.w)
+    def to_list(self): return list(self)
+    def to_array(self): return path_array(self, self.w, self.h)
+
+    @property
+    def nbytes(self): return len(self.data)
+
+    def __repr__(self):
+        return f"PackedTour({self.w}x{self.h}, start={self.start}, casas={len(self)}, {self.nbytes} bytes)"
+
+def is_valid_tour(path, w, h=None, closed=False):
+    """Passeio completo: cobre todas as casas uma vez, só com saltos de cavalo
+       (e, se closed, volta à casa inicial)."""
+    h = w if h is None else h
+    if not path or len(path) != w * h or len(set(path)) != w * h or not all(0 <= i < w * h for i in path):
+        return False
+    pairs = zip(path, path[1:] + path[:1]) if closed else zip(path, path[1:])
+    return all(abs(a % w - b % w) * abs(a // w - b // w) == 2 for a, b in pairs)
+
+# ----------------------------
+# Motor de Warnsdorff com graus incrementais
+# ----------------------------
+WARNSDORFF_TIE_BREAKS = ('random', 'first', 'pohl', 'squirrel', 'roth')
+
+# Esquema de Squirrel & Cull (1996): partindo de um canto, os empates de Warnsdorff são
+# resolvidos por uma ordem fixa de lances que depende só de n mod 8. Índices de KNIGHT_MOVES,
+# obtidos por busca exaustiva das 8! ordens a partir da casa 0 e conferidos para todo
+# tabuleiro quadrado 5 <= n <= SQUIRREL_VERIFIED (em n = 742, 744 e 745 a ordem já falha).
+SQUIRREL_ORDERS = ((2, 3, 4, 1, 6, 7, 0, 5), (4, 5, 6, 3, 0, 1, 7, 2), (2, 3, 1, 4, 7, 6, 0, 5),
+                   (0, 2, 5, 3, 4, 1, 7, 6), (2, 4, 7, 6, 0, 1, 3, 5), (2, 4, 1, 3, 6, 5, 0, 7),
+                   (2, 3, 4, 1, 7, 6, 0, 5), (2, 4, 3, 1, 6, 7, 5, 0))
+SQUIRREL_VERIFIED = 741
+
+def warnsdorff_extend(n, path, tie_break='random', rng=random, height=None):
+    """Estende 'path' (in-place) pela regra de Warnsdorff mantendo um vetor de graus vivo:
+       ao visitar uma casa, só os graus dos seus vizinhos são decrementados (O(1) por passo).
+       tie_break: 'random' (sorteio entre empates), 'first' (ordem de KNIGHT_MOVES),
+       'pohl' (menor soma dos graus seguintes), 'squirrel' (primeiro lance na ordem de
+       SQUIRREL_ORDERS[n % 8]; completa o passeio a partir da casa 0 de um tabuleiro n x n,
+       5 <= n <= SQUIRREL_VERIFIED, e dos outros cantos via symmetric_tour) ou 'roth'
+       (mais distante do centro).
+       height: altura de um tabuleiro retangular (n é a largura)."""
+    if tie_break not in WARNSDORFF_TIE_BREAKS:
+        raise ValueError(f"Desempate desconhecido: {tie_break!r}")
+    topo = get_topology(n, height)
+    neighbors = topo.neighbors
+    deg = list(topo.degree)
+    visited = bytearray(topo.size)
+    for v in path:
+        visited[v] = 1
+        for u in neighbors[v]: deg[u] -= 1
+    if tie_break == 'roth':
+        cx, cy = (n - 1) / 2, (topo.h - 1) / 2
+        dist = [(x - cx) ** 2 + (y - cy) ** 2 for x, y in (idx_to_xy(i, n) for i in range(topo.size))]
+    elif tie_break == 'squirrel':
+        rank = [0] * 8
+        for r, k in enumerate(SQUIRREL_ORDERS[n % 8]): rank[k] = r
+    cur = path[-1]
+    while True:
+        pool = []; min_deg = 9
+        for j in neighbors[cur]:
+            if visited[j]: continue
+            d = deg[j]
+            if d < min_deg: min_deg = d; pool = [j]
+            elif d == min_deg: pool.append(j)
+        if not pool:
+            break
+        if tie_break == 'random':
+            cur = rng.choice(pool)
+        elif len(pool) == 1 or tie_break == 'first':
+            cur = pool[0]
+        elif tie_break == 'pohl':
+            # Pohl: desempata pela soma dos graus dos vizinhos ainda livres de cada candidato
+            cur = min(pool, key=lambda j: sum(deg[k] for k in neighbors[j] if not visited[k]))
+        elif tie_break == 'squirrel':
+            x, y = cur % n, cur // n
+            cur = min(pool, key=lambda j: rank[MOVE_CODES[(j % n - x, j // n - y)]])
+        else:
+            cur = max(pool, key=lambda j: dist[j])
+        path.append(cur)
+        visited[cur] = 1
+        for u in neighbors[cur]: deg[u] -= 1
+    return path
+
+def randomized_warnsdorff_extend(n, path, height=None):
+    """Tenta estender 'path' (lista de índices) sem repetir casas,
+    usando Warnsdorff com desempate aleatório."""
+    return warnsdorff_extend(n, path, tie_break='random', height=height)
+
+def warnsdorff_tour(n, start_idx=0, tie_break='first', height=None):
+    return warnsdorff_extend(n, [start_idx], tie_break=tie_break, height=height)
+
+# ----------------------------
+# Backtracking iterativo (pilha explícita + bitmask)
+# ----------------------------
+BT_CHECK_EVERY = 4096   # nós entre consultas ao relógio
+
+def backtracking_tour(n, start_idx=0, time_limit=5.0, prune=True, stats=None, should_stop=None, height=None):
+    """Busca em profundidade com ordenação de Warnsdorff, sem recursão (não esbarra no
+       limite de recursão do Python). Casas visitadas num inteiro usado como bitmask e graus
+       mantidos incrementalmente; o relógio só é consultado a cada BT_CHECK_EVERY nós.
+       prune: corta ramos com casa livre isolada (grau 0) ou com mais de uma casa de grau 1
+       fora do alcance imediato (cada uma delas teria de ser o fim do passeio).
+       Se 'stats' (dict) for passado, recebe nodes, elapsed, nodes_per_sec e timed_out.
+       should_stop(): consultada junto com o relógio; se retornar True a busca é abandonada.
+       height: altura de um tabuleiro retangular (n é a largura).
+       Retorna o caminho completo ou None."""
+    topo = get_topology(n, height); neighbors = topo.neighbors; n2 = topo.size
+    deg = list(topo.degree)
+    ones = sum(1 for i in range(n2) if deg[i] == 1)   # casas livres com grau 1
+    visited = 0
+    start_time = time.perf_counter(); deadline = start_time + time_limit
+    nodes = 0; timed_out = False; result = None
+
+    def visit(v):
+        nonlocal visited, ones
+        visited |= 1 << v
+        if deg[v] == 1: ones -= 1
+        for u in neighbors[v]:
+            d = deg[u] = deg[u] - 1
+            if not visited & (1 << u):
+                if d == 1: ones += 1
+                elif d == 0: ones -= 1
+
+    def unvisit(v):
+        nonlocal visited, ones
+        for u in neighbors[v]:
+            d = deg[u]
+            if not visited & (1 << u):
+                if d == 1: ones -= 1
+                elif d == 0: ones += 1
+            deg[u] = d + 1
+        visited ^= 1 << v
+        if deg[v] == 1: ones += 1
+
+    def dead_end(v, remaining):
+        if remaining <= 1: return False
+        o = 0
+        for u in neighbors[v]:
+            if not visited & (1 << u):
+                if deg[u] == 0: return True
+                if deg[u] == 1: o += 1
+        return ones - o > 1
+
+    def ordered(v):
+        nexts = [u for u in neighbors[v] if not visited & (1 << u)]
+        nexts.sort(key=deg.__getitem__)
+        return nexts
+
+    path = [start_idx]; visit(start_idx)
+    if n2 == 1: result = path
+    stack = [[ordered(start_idx), 0]]
+    while stack and result is None:
+        frame = stack[-1]
+        cands, i = frame
+        if i == len(cands):
+            stack.pop(); unvisit(path.pop())
+            continue
+        frame[1] = i + 1
+        j = cands[i]
+        nodes += 1
+        if nodes % BT_CHECK_EVERY == 0:
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+            if should_stop is not None and should_stop():
+                break
+        visit(j); path.append(j)
+        if len(path) == n2:
+            result = path
+        elif prune and dead_end(j, n2 - len(path)):
+            unvisit(path.pop())
+        else:
+            stack.append([ordered(j), 0])
+
+    if stats is not None:
+        elapsed = time.perf_counter() - start_time
+        stats.update(nodes=nodes, elapsed=elapsed, nodes_per_sec=nodes / elapsed if elapsed > 0 else None,
+                     timed_out=timed_out)
+    return result
+
+# ----------------------------
+# Dividir e conquistar (tabuleiros grandes e passeios fechados)
+# ----------------------------
+DC_ODD_PARTS = (5, 7, 9, 11)   # lados possíveis do bloco "ímpar" (só quando o lado do tabuleiro é ímpar)
+DC_VARIANTS = 8                # passeios alternativos por bloco, caso a costura falhe com o primeiro
+DC_BLOCK_NODES = 20000         # nós por tentativa na busca dos blocos
+
+def _rect_neighbors(h, w):
+    return [tuple((y+dy)*w + x+dx for dx, dy in KNIGHT_MOVES if 0 <= x+dx < w and 0 <= y+dy < h)
+            for y in range(h) for x in range(w)]
+
+def _block_search(nb, start, closed, rng):
+    """DFS com ordenação de Warnsdorff e desempate sorteado; None se estourar DC_BLOCK_NODES."""
+    N = len(nb); deg = [len(a) for a in nb]; visited = bytearray(N)
+    def visit(v, d):
+        visited[v] ^= 1
+        for u in nb[v]: deg[u] -= d
+    def ordered(v):
+        c = [u for u in nb[v] if not visited[u]]; rng.shuffle(c); c.sort(key=deg.__getitem__)
+        return c
+    closing = nb[start]
+    path = [start]; visit(start, 1); stack = [[ordered(start), 0]]; nodes = 0
+    if N == 1: return path
+    while stack:
+        frame = stack[-1]
+        if frame[1] == len(frame[0]):
+            stack.pop(); visit(path.pop(), -1)
+            continue
+        j = frame[0][frame[1]]; frame[1] += 1; nodes += 1
+        if nodes > DC_BLOCK_NODES: return None
+        visit(j, 1); path.append(j)
+        if len(path) == N:
+            if not closed or j in closing: return path
+        # fechado: a casa inicial precisa manter algum vizinho livre até o fim
+        elif not closed or any(not visited[u] for u in closing):
+            stack.append([ordered(j), 0])
+            continue
+        visit(path.pop(), -1)
+    return None
+
+@lru_cache(maxsize=None)
+def _block_tour(h, w, start, closed, variant=0):
+    """Passeio de um bloco pequeno h x w: fechado, ou aberto a partir de 'start'.
+       A semente depende só dos argumentos, então o resultado é reprodutível."""
+    nb = _rect_neighbors(h, w)
+    rng = random.Random(f"{h}x{w}:{start}:{closed}:{variant}")
+    for _ in range(50):
+        path = _block_search(nb, start, closed, rng)
+        if path: return tuple(path)
+    return None
+
+def _split_even(L):
+    parts = []
+    while L > 10:
+        step = 6 if L - 8 in (2, 4) else 8
+        parts.append(step); L -= step
+    if L: parts.append(L)
+    return parts
+
+def _split_axis(L, at=None):
+    """Divide um lado em partes de 6..10 casas (mais uma parte ímpar de DC_ODD_PARTS se L for
+       ímpar, posicionada de modo a cobrir a coordenada 'at'). None se L não puder ser dividido."""
+    valid = lambda v: v == 0 or (v >= 6 and v % 2 == 0)
+    if L % 2 == 0:
+        return _split_even(L) if valid(L) else None
+    at = 0 if at is None else at
+    for P in range(at - at % 2, -1, -2):
+        if not valid(P): continue
+        for o in DC_ODD_PARTS:
+            R = L - P - o
+            if at < P + o and R >= 0 and valid(R):
+                return _split_even(P) + [o] + _split_even(R)
+    return None
+
+def divide_conquer_tour(n, start_idx=0, closed=False, height=None):
+    """Passeio por dividir e conquistar para tabuleiros grandes (n colunas x height linhas;
+       height=None -> quadrado), em tempo ~linear. O tabuleiro é fatiado em blocos de 5..11
+       casas de lado, cada bloco recebe um passeio fechado pequeno (_block_tour) e os ciclos são
+       costurados um a um: remove-se uma aresta de cada lado da fronteira e liga-se as pontas
+       com dois saltos de cavalo que a cruzam.
+       Com os dois lados ímpares não existe passeio fechado: o bloco da casa inicial recebe um
+       passeio aberto que parte dela e o resultado é um caminho. Retorna None quando não há
+       construção (closed=True nesse caso, casa inicial da cor minoritária ou lado menor que 5)."""
+    w = n; h = n if height is None else height; N = w * h
+    if N == 1: return [start_idx]
+    sx, sy = start_idx % w, start_idx // w
+    odd_board = w % 2 == 1 and h % 2 == 1
+    if odd_board and (closed or (sx + sy) % 2 == 1): return None
+    cols = _split_axis(w, sx if odd_board else None); rows = _split_axis(h, sy if odd_board else None)
+    if cols is None or rows is None or min(w, h) < 5: return None
+
+    A = [-1] * N; B = [-1] * N   # os (até) dois vizinhos de cada casa no ciclo/caminho
+    done = bytearray(N)          # casas já incorporadas ao componente
+    def replace(a, old, new):
+        if A[a] == old: A[a] = new
+        else: B[a] = new
+
+    def stitch(cells):
+        """Costura o bloco recém-colocado ao componente por uma das casas 'cells' (na fronteira)."""
+        for b1 in cells:
+            x, y = b1 % w, b1 // w
+            for dx, dy in KNIGHT_MOVES:
+                if not (0 <= x+dx < w and 0 <= y+dy < h): continue
+                a1 = (y+dy)*w + x+dx
+                if not done[a1]: continue
+                for b2 in (A[b1], B[b1]):
+                    if b2 < 0: continue
+                    bx, by = b2 % w, b2 // w
+                    for a2 in (A[a1], B[a1]):
+                        if a2 >= 0 and abs(a2 % w - bx) * abs(a2 // w - by) == 2:
+                            replace(a1, a2, b1); replace(a2, a1, b2); replace(b1, b2, a1); replace(b2, b1, a2)
+                            return True
+        return False
+
+    y0 = 0
+    for r, bh in enumerate(rows):
+        x0 = 0
+        for c, bw in enumerate(cols):
+            is_open = odd_board and bh % 2 == 1 and bw % 2 == 1
+            local_start = (sy - y0) * bw + (sx - x0) if is_open else 0
+            if c > 0:   # costura pela fronteira esquerda
+                cells = [(y0+y)*w + x0+x for y in range(bh) for x in range(2)]
+            else:       # primeira coluna de blocos: costura pela fronteira de cima
+                cells = [(y0+y)*w + x0+x for y in range(2) for x in range(bw)]
+            for variant in range(DC_VARIANTS):
+                tour = _block_tour(bh, bw, local_start, not is_open, variant)
+                cyc = [(y0 + t // bw) * w + x0 + t % bw for t in tour]
+                for i, g in enumerate(cyc):
+                    A[g] = cyc[i-1] if (i > 0 or not is_open) else -1
+                    B[g] = cyc[i+1] if i + 1 < len(cyc) else (-1 if is_open else cyc[0])
+                if (r == 0 and c == 0) or stitch(cells):
+                    break
+            else:
+                raise RuntimeError(f"Não foi possível costurar o bloco {bh}x{bw} em ({x0},{y0})")
+            for g in cyc: done[g] = 1
+            x0 += bw
+        y0 += bh
+
+    path = [start_idx]; prev = -1; cur = start_idx
+    for _ in range(N - 1):
+        cur, prev = (A[cur] if A[cur] != prev else B[cur]), cur
+        path.append(cur)
+    return path
+
+# ----------------------------
+# Instrumentação do GA
+# ----------------------------
+GA_PHASES = ('selection', 'crossover', 'mutation', 'repair', 'evaluation')
+GA_COUNTERS = ('evaluations', 'repair_swaps', 'crossover_fallbacks', 'warnsdorff_extended')
+
+class GAProfiler:
+    """Tempos por fase e contadores do GA, opcional: com ga.profiler = None (padrão) os pontos
+       de medição custam um teste de atributo. Cada geração vira um registro em 'records'
+       (tempos da geração, contadores da geração, aptidões), exportável em JSON ou CSV.
+       warnsdorff_extended soma quantas casas a extensão de Warnsdorff acrescentou aos prefixos."""
+    def __init__(self):
+        self.totals = dict.fromkeys(GA_PHASES, 0.0)
+        self.counters = dict.fromkeys(GA_COUNTERS, 0)
+        self.records = []
+        self._phase = dict.fromkeys(GA_PHASES, 0.0)
+        self._count = dict.fromkeys(GA_COUNTERS, 0)
+        self._last = self._gen_start = time.perf_counter()
+
+    def start_generation(self):
+        self._last = self._gen_start = time.perf_counter()
+
+    def lap(self, phase):
+        """Atribui a 'phase' o tempo desde a última marcação."""
+        now = time.perf_counter()
+        self._phase[phase] += now - self._last
+        self._last = now
+
+    def count(self, name, amount=1):
+        self._count[name] += amount
+
+    def end_generation(self, ga):
+        elapsed = time.perf_counter() - self._gen_start
+        rec = {'generation': ga.generation, 'best_fitness': ga.best_fitness,
+               'avg_fitness': ga.avg_fitness_history[-1] if ga.avg_fitness_history else None, 'elapsed': elapsed}
+        rec.update(self._phase); rec.update(self._count)
+        self.records.append(rec)
+        for k, v in self._phase.items(): self.totals[k] += v
+        for k, v in self._count.items(): self.counters[k] += v
+        self._phase = dict.fromkeys(GA_PHASES, 0.0)
+        self._count = dict.fromkeys(GA_COUNTERS, 0)
+
+    def summary(self):
+        """Totais da execução: tempo e fração por fase, contadores e taxas."""
+        total = sum(r['elapsed'] for r in self.records)
+        evaluations = self.counters['evaluations'] + self._count['evaluations']
+        return {'generations': self.records[-1]['generation'] if self.records else 0, 'elapsed': total,
+                'phases': {k: {'seconds': v, 'share': v / total if total else 0.0} for k, v in self.totals.items()},
+                'counters': {k: self.counters[k] + self._count[k] for k in GA_COUNTERS},
+                'generations_per_sec': len(self.records[1:]) / total if total else 0.0,
+                'evaluations_per_sec': evaluations / total if total else 0.0}
+
+    def readout(self):
+        """Linha curta para barras de status: ritmo e a fase mais cara da última geração."""
+        if not self.records: return "-"
+        rec = self.records[-1]; elapsed = rec['elapsed'] or 1e-12
+        phase = max(GA_PHASES, key=rec.__getitem__)
+        return f"{1 / elapsed:.1f} ger/s, {rec['evaluations'] / elapsed:.0f} aval/s, {phase} {rec[phase] / elapsed:.0%}"
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'records': self.records}, f, indent=1)
+
+    def to_csv(self, path):
+        fields = ['generation', 'best_fitness', 'avg_fitness', 'elapsed', *GA_PHASES, *GA_COUNTERS]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader(); writer.writerows(self.records)
+
+    def export(self, path):
+        """Grava em CSV se o arquivo terminar em .csv, senão em JSON."""
+        (self.to_csv if path.lower().endswith('.csv') else self.to_json)(path)
+
+# ----------------------------
+# Controle adaptativo do GA
+# ----------------------------
+class AdaptiveController:
+    """Acompanha best_fitness_history e reage a platôs. A cada 'window' gerações sem melhora:
+       primeiro aumenta a mutação (x mutation_boost, até max_mutation) e o torneio (+1, até
+       max_tourn), por até 'escalations' janelas; depois reinicia uma fração da população
+       (os piores) com passeios aleatórios novos. Uma melhora devolve mutação e torneio aos
+       valores originais. update() pede a parada quando max_restarts reinícios seguidos não
+       trouxeram melhora, ou quando, já tendo reiniciado, a melhora esperada até o limite de
+       gerações (ritmo das últimas 4 janelas x gerações restantes) fica abaixo de min_expected_gain.
+       state: dicionário de state() salvo num checkpoint; o controlador retoma de onde parou
+       (valores base, platô em curso, reinícios), em vez de tomar a mutação já escalada como base."""
+    STATE_FIELDS = ('base_mutation', 'base_tourn', 'last_best', 'last_improvement', 'escalated', 'restarts',
+                    'total_restarts', 'stopped_early')
+
+    def __init__(self, ga, window=50, mutation_boost=1.5, max_mutation=0.5, max_tourn=None, escalations=2,
+                 restart_fraction=0.3, max_restarts=3, min_expected_gain=1.0, state=None):
+        self.ga = ga
+        self.base_mutation, self.base_tourn = (state['base_mutation'], state['base_tourn']) if state else (ga.mutation_rate, ga.tourn)
+        self.window = window; self.mutation_boost = mutation_boost; self.max_mutation = max(max_mutation, self.base_mutation)
+        self.max_tourn = min(ga.pop_size, max_tourn or 2 * self.base_tourn); self.escalations = escalations
+        self.restart_fraction = restart_fraction; self.max_restarts = max_restarts; self.min_expected_gain = min_expected_gain
+        self.last_best = ga.best_fitness; self.last_improvement = ga.generation
+        self.escalated = 0; self.restarts = 0; self.total_restarts = 0
+        self.stopped_early = False
+        self.events = []   # (geração, evento, detalhe)
+        if state:
+            for k in self.STATE_FIELDS: setattr(self, k, state[k])
+            self.events = [(g, ev, tuple(d) if isinstance(d, list) else d) for g, ev, d in state['events']]
+
+    def state(self):
+        """Estado da execução em forma serializável em JSON (vai nos metadados do checkpoint)."""
+        return dict({k: getattr(self, k) for k in self.STATE_FIELDS}, events=self.events)
+
+    def expected_gain(self, generations_left):
+        hist = self.ga.best_fitness_history
+        h = min(len(hist) - 1, 4 * self.window)
+        if h <= 0: return float('inf')
+        return (hist[-1] - hist[-1 - h]) / h * generations_left
+
+    def update(self, generation_limit=GA_GEN_LIMIT):
+        """Chamar depois de cada ga.step(). Retorna True quando não vale mais continuar."""
+        ga = self.ga
+        if ga.best_fitness > self.last_best:
+            if self.escalated or self.restarts:
+                ga.mutation_rate, ga.tourn = self.base_mutation, self.base_tourn
+                self.events.append((ga.generation, 'improved', ga.best_fitness))
+            self.last_best = ga.best_fitness; self.last_improvement = ga.generation
+            self.escalated = self.restarts = 0
+            return False
+        stalled = ga.generation - self.last_improvement
+        if stalled == 0 or stalled % self.window:
+            return False
+        if self.restarts >= self.max_restarts or (
+                self.restarts and self.expected_gain(generation_limit - ga.generation) < self.min_expected_gain):
+            self.stopped_early = True
+            self.events.append((ga.generation, 'stop', ga.best_fitness))
+            return True
+        if self.escalated < self.escalations:
+            ga.mutation_rate = min(self.max_mutation, ga.mutation_rate * self.mutation_boost)
+            ga.tourn = min(self.max_tourn, ga.tourn + 1)
+            self.escalated += 1
+            self.events.append((ga.generation, 'escalate', (round(ga.mutation_rate, 4), ga.tourn)))
+        else:
+            self.restart()
+        return False
+
+    def restart(self):
+        """Troca os piores restart_fraction da população por indivíduos novos (mesma casa inicial)."""
+        ga = self.ga
+        count = max(1, int(ga.pop_size * self.restart_fraction))
+        ga.replace_worst([ga.random_individual(ga.best[0]) for _ in range(count)])
+        ga.mutation_rate, ga.tourn = self.base_mutation, self.base_tourn
+        self.escalated = 0; self.restarts += 1; self.total_restarts += 1
+        self.events.append((ga.generation, 'restart', count))
+
+# ----------------------------
+# Avaliação paralela (processos)
+# ----------------------------
+_WORKER_GA = {}
+
+def _evaluate_chunk(args):
+    """Executado nos processos do pool: avalia um lote de cromossomos com as sementes recebidas."""
+    (n, h), chroms, prefixes, seeds = args
+    ga = _WORKER_GA.get((n, h))
+    if ga is None:
+        ga = _WORKER_GA[n, h] = GeneticKnightTour(n, 0, 0.0, 0, height=h)
+    return [ga.fitness(ch, random.Random(sd), pre) for ch, pre, sd in zip(chroms, prefixes, seeds)]
+
+class GeneticKnightTour:
+    def __init__(self, n, population_size, mutation_rate, tourn_size, workers=1, height=None):
+        self.n = n                     # largura (colunas)
+        self.h = n if height is None else height
+        self.n2 = n * self.h           # casas do tabuleiro = genes por cromossomo
+        self.pop_size = population_size
+        self.mutation_rate = mutation_rate
+        self.tourn = tourn_size
+        self.workers = max(1, workers)
+        self._pool = None              # pool persistente, criado na primeira avaliação paralela
+        self.population = []
+        self.fitnesses = []
+        self.generation = 0
+        self.best = None               # melhor cromossomo (perm)
+        self.best_fitness = -1         # tamanho do prefixo legal - 1 (número de arestas legais)
+        self.best_path = None          # caminho 100% legal correspondente a 'best'
+        self.best_fitness_history = []
+        self.avg_fitness_history = []
+        self.profiler = None           # GAProfiler opcional
+        self.controller = None         # AdaptiveController opcional (run_ga / GUI)
+        self.controller_state = None   # estado do controlador lido de um checkpoint (load_checkpoint)
+
+    # ---------- Construção e reparo ----------
+    def init_population(self, start_idx=0):
+        self.generation = 0
+        self.best_fitness = -1
+        self.best_path = None
+        self.best_fitness_history = []
+        self.avg_fitness_history = []
+        prof = self.profiler
+        if prof: prof.start_generation()
+        population = []
+        prefixes = []
+
+        for _ in range(self.pop_size):
+            chrom = self.random_individual(start_idx)
+            prefixes.append(self.repair(chrom))  # já sai "legalizado"
+            population.append(chrom)
+
+        self.population = population
+        if prof: prof.lap('repair')
+        self.evaluate_all(prefixes, chroms=population)
+        if prof: prof.lap('evaluation'); prof.end_generation(self)  # registro da geração 0
+
+    def random_individual(self, start_idx=0):
+        """Em vez de uma permutação pura: passeio de cavalo aleatório completado com as casas faltantes."""
+        walk = random_knight_walk(self.n, start_idx=start_idx, height=self.h)
+        remaining = list(set(range(self.n2)) - set(walk))
+        random.shuffle(remaining)
+        return walk + remaining
+
+    def _legal_prefix(self, chrom, start=1):
+        """Retorna o maior prefixo SEM repetir casas e só com movimentos válidos de cavalo.
+           Também retorna a versão 'ajustada' do cromossomo (com swaps locais).
+           start: quantos genes iniciais já se sabe formarem um prefixo legal; eles são
+           reaproveitados sem nova checagem e a caminhada recomeça dali.
+           Quando o próximo gene é ilegal, em vez de varrer o resto do cromossomo olha só os
+           (até 8) vizinhos de cavalo de 'prev', via um índice gene -> posição."""
+        n2 = self.n2
+        topo = get_topology(self.n, self.h)
+        neighbors = topo.neighbors
+        start = max(1, start)
+        visited = set(chrom[:start])
+        path = chrom[:start]
+        chrom_adj = chrom[:]  # trabalhamos numa cópia
+        pos = None            # gene -> posição em chrom_adj (montado no primeiro reparo)
+        swaps = 0
+
+        for i in range(start, n2):
+            prev = path[-1]
+            cur = chrom_adj[i]
+
+            # se já foi visitado ou o movimento não é legal, tentar achar gene mais à frente alcançável
+            if (cur in visited) or (cur not in neighbors[prev]):
+                if pos is None:
+                    pos = [0] * n2
+                    for k, g in enumerate(chrom_adj): pos[g] = k
+                # o vizinho livre mais próximo de i é o mesmo que a varredura linear acharia
+                j = n2
+                for cand in neighbors[prev]:
+                    p = pos[cand]
+                    if i < p < j and cand not in visited:
+                        j = p
+                if j == n2:
+                    # não dá para seguir legalmente
+                    break
+                # colocar candidato na posição i
+                chrom_adj[i], chrom_adj[j] = chrom_adj[j], chrom_adj[i]
+                pos[chrom_adj[i]] = i; pos[chrom_adj[j]] = j
+                cur = chrom_adj[i]
+                swaps += 1
+
+            # agora cur é novo e alcançável
+            visited.add(cur)
+            path.append(cur)
+
+        if swaps and self.profiler is not None: self.profiler.count('repair_swaps', swaps)
+        return path, chrom_adj
+
+    def _legal_run(self, chrom):
+        """Quantos genes iniciais já formam movimentos legais (cromossomo é permutação)."""
+        neighbors = get_topology(self.n, self.h).neighbors
+        i = 1
+        while i < len(chrom) and chrom[i] in neighbors[chrom[i-1]]:
+            i += 1
+        return i
+
+    def repair(self, chrom, start=1):
+        """Repara um cromossomo para maximizar o prefixo legal via swaps locais.
+           O cromossomo original é modificado in-place. Retorna o prefixo legal."""
+        path, fixed = self._legal_prefix(chrom, start)
+        chrom[:] = fixed  # sobrescreve com a versão reparada
+        return path
+
+    # ---------- Avaliação ----------
+    def fitness(self, chrom, rng=random, prefix=None):
+        # 1) obtém prefixo legal (reaproveita o do reparo, se já conhecido)
+        base_path = prefix if prefix is not None else self._legal_prefix(chrom)[0]
+        # 2) estende localmente com Warnsdorff aleatório (memético leve)
+        extended = warnsdorff_extend(self.n, base_path[:], tie_break='random', rng=rng, height=self.h)
+        # fitness = arestas legais do caminho estendido
+        return max(0, len(extended) - 1), extended
+ 
+    def evaluate_all(self, prefixes=None, cached=None, chroms=None):
+        """Avalia a população. prefixes[i]: prefixo legal já conhecido do indivíduo i (ou None);
+           cached: {i: (aptidão, caminho)} de indivíduos inalterados, que não são reavaliados;
+           chroms: a população em listas, quando quem chama já a tem (evita reler self.population)."""
+        # Uma semente por indivíduo, sorteada do RNG principal: o resultado
+        # não depende de quantos processos fazem a avaliação.
+        population = self.population if chroms is None else chroms
+        seeds = [random.getrandbits(64) for _ in population]
+        if prefixes is None:
+            prefixes = [None] * len(population)
+        cached = cached or {}
+        todo = [i for i in range(len(population)) if i not in cached]
+        if self.workers > 1:
+            computed = self._evaluate_parallel([population[i] for i in todo], [prefixes[i] for i in todo],
+                                               [seeds[i] for i in todo])
+        else:
+            computed = [self.fitness(population[i], random.Random(seeds[i]), prefixes[i]) for i in todo]
+        prof = self.profiler
+        if prof is not None:
+            prof.count('evaluations', len(todo))
+            prof.count('warnsdorff_extended', sum(len(computed[k][1]) - len(prefixes[i])
+                                                  for k, i in enumerate(todo) if prefixes[i] is not None))
+        results = [None] * len(population)
+        for i, res in zip(todo, computed): results[i] = res
+        for i, res in cached.items(): results[i] = res
+        fits = [f for f, _ in results]
+        paths = [p for _, p in results]
+
+        self.fitnesses = fits
+        current_gen_best = max(range(self.pop_size), key=lambda i: self.fitnesses[i])
+        current_best_fit = self.fitnesses[current_gen_best]
+
+        if current_best_fit > self.best_fitness:
+            self.best_fitness = current_best_fit
+            self.best = population[current_gen_best][:]
+            self.best_path = paths[current_gen_best][:]
+
+        self.best_fitness_history.append(self.best_fitness)
+        self.avg_fitness_history.append(sum(self.fitnesses) / self.pop_size)
+
+    def _evaluate_parallel(self, population, prefixes, seeds):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers)
+        chunk = max(1, math.ceil(len(population) / (self.workers * 4)))
+        tasks = [((self.n, self.h), population[i:i+chunk], prefixes[i:i+chunk], seeds[i:i+chunk])
+                 for i in range(0, len(population), chunk)]
+        results = []
+        for part in self._pool.map(_evaluate_chunk, tasks):
+            results.extend(part)
+        return results
+
+    def close(self):
+        """Encerra o pool de processos (se houver)."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def chromosome(self, i):
+        """Cópia (lista) do cromossomo i."""
+        return self.population[i][:]
+
+    def replace_worst(self, chroms):
+        """Troca os piores indivíduos por 'chroms' (migrantes de outra ilha), avaliando só eles."""
+        population = self.population
+        worst = sorted(range(len(population)), key=self.fitnesses.__getitem__)
+        for i, chrom in zip(worst, chroms):
+            chrom = list(chrom)
+            prefix = self.repair(chrom)
+            f, path = self.fitness(chrom, random.Random(random.getrandbits(64)), prefix)
+            population[i] = chrom
+            self.fitnesses[i] = f
+            if f > self.best_fitness:
+                self.best_fitness, self.best, self.best_path = f, chrom[:], path[:]
+        self.population = population
+
+    # ---------- Seleção, Crossover, Mutação ----------
+    def tournament_select(self):
+        k = self.tourn
+        candidates = random.sample(range(self.pop_size), k)
+        best_idx = max(candidates, key=lambda i: self.fitnesses[i])
+        return self.population[best_idx][:]
+
+    def order_crossover(self, p1, p2):
+        n = len(p1)
+        a, b = sorted(random.sample(range(n), 2))
+        child = [-1] * n
+        child[a:b+1] = p1[a:b+1]
+        taken = set(child[a:b+1])
+        fill_pos = (b + 1) % n
+        for gene in p2[b+1:] + p2[:b+1]:
+            if gene not in taken:
+                child[fill_pos] = gene
+                fill_pos = (fill_pos + 1) % n
+        return child
+
+    def mutate(self, chrom):
+        """Troca ou inversão; retorna a primeira posição alterada."""
+        if random.random() < 0.5:
+            i, j = random.sample(range(1, len(chrom)), 2)
+            chrom[i], chrom[j] = chrom[j], chrom[i]
+            return min(i, j)
+        else:
+            a, b = sorted(random.sample(range(1, len(chrom)), 2))
+            chrom[a:b+1] = reversed(chrom[a:b+1])
+            return a
+
+    # ---------- Loop ----------
+    def step(self):
+        prof = self.profiler
+        if prof: prof.start_generation()
+        newpop = [self.best[:]]  # elitismo (já está reparado)
+        prefixes = [None]
+        while len(newpop) < self.pop_size:
+            p1 = self.tournament_select()
+            p2 = self.tournament_select()
+            if prof: prof.lap('selection')
+            child = self.edge_recombination_crossover(p1, p2)
+            # o reparo só precisa recomeçar onde o prefixo legal do filho acaba
+            # (ou no primeiro gene mutado, se vier antes)
+            start = self._legal_run(child)
+            if prof: prof.lap('crossover')
+            if random.random() < self.mutation_rate:
+                start = min(start, self.mutate(child))
+            if prof: prof.lap('mutation')
+            # Repara o filho antes de entrar na população
+            prefixes.append(self.repair(child, start))
+            newpop.append(child)
+            if prof: prof.lap('repair')
+
+        self.population = newpop
+        # o elite não mudou: reaproveita a avaliação que o tornou o melhor
+        self.evaluate_all(prefixes, cached={0: (self.best_fitness, self.best_path)}, chroms=newpop)
+        self.generation += 1
+        if prof: prof.lap('evaluation'); prof.end_generation(self)
+
+    
+        return self.best_fitness == self.n2 - 1
+    
+    def edge_recombination_crossover(self, p1, p2):
+        """ERX: constrói um filho preservando adjacências dos pais.
+           A tabela de arestas é indexada pelo gene; ao colocar um gene só as listas dos
+           seus vizinhos são atualizadas, e o sorteio de fallback usa um pool de genes livres."""
+        n = len(p1)
+        # tabela de adjacências (até 4 vizinhos por gene, sem repetição)
+        adj = [[] for _ in range(n)]
+        for par in (p1, p2):
+            prev = par[-1]
+            for g in par:
+                if g not in adj[prev]:
+                    adj[prev].append(g)
+                    if g != prev: adj[g].append(prev)
+                prev = g
+
+        # pool de genes ainda não usados, com remoção O(1) (troca com o último)
+        free = list(p1)
+        pos = [0] * n
+        for i, g in enumerate(free): pos[g] = i
+
+        child = []
+        cur = p1[0]  # pode variar; simples: começa no primeiro de p1
+        fallbacks = 0
+        for _ in range(n):
+            child.append(cur)
+            last = free.pop()
+            if last != cur:
+                free[pos[cur]] = last; pos[last] = pos[cur]
+            # remove 'cur' das listas adjacentes (só os vizinhos de cur o contêm)
+            for k in tuple(adj[cur]):
+                adj[k].remove(cur)
+            # escolhe próximo:
+            # 1) entre adjacentes de cur, pegue aquele cujo conjunto adjacente é menor (mais restrito)
+            candidates = adj[cur]
+            if candidates:
+                cur = min(candidates, key=lambda x: len(adj[x]))
+            else:
+                # 2) se não há adjacente disponível, escolha qualquer gene ainda não usado
+                if not free:
+                    break
+                cur = random.choice(free)
+                fallbacks += 1
+        if self.profiler is not None: self.profiler.count('crossover_fallbacks', fallbacks)
+        return child
+
+# ----------------------------
+# GA com população em matriz NumPy
+# ----------------------------
+class ArrayGeneticKnightTour(GeneticKnightTour):
+    """Mesmo GA, mas a população fica numa matriz NumPy contígua (pop_size, n*h).
+       Seleção por torneio, ERX, mutação (troca/inversão) e checagem de legalidade entre
+       genes consecutivos são feitas em lote sobre a matriz; só o reparo e a extensão de
+       Warnsdorff da avaliação rodam por indivíduo, em listas convertidas uma vez por geração.
+       A próxima geração é escrita num segundo buffer pré-alocado (sem np.array([...]))."""
+    def __init__(self, n, population_size, mutation_rate, tourn_size, workers=1, height=None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("ArrayGeneticKnightTour requer numpy (pip install numpy).")
+        n2 = n * (n if height is None else height)
+        self.dtype = np.int16 if n2 <= np.iinfo(np.int16).max else np.int32
+        self.pop_matrix = np.empty((0, n2), dtype=self.dtype)
+        self._spare = None             # buffer da próxima geração (troca com pop_matrix a cada step)
+        cells = np.arange(n2)
+        self._xs = (cells % n).astype(self.dtype); self._ys = (cells // n).astype(self.dtype)
+        self.np_rng = np.random.default_rng()
+        super().__init__(n, population_size, mutation_rate, tourn_size, workers, height)
+
+    # Interface em listas para checkpoint, ilhas e código legado. Atenção: cada leitura de
+    # 'population' devolve uma cópia completa da matriz em listas (O(pop_size * n*h)); o laço
+    # do GA não a usa. Para um indivíduo, use chromosome(i).
+    @property
+    def population(self):
+        return self.pop_matrix.tolist()
+
+    @population.setter
+    def population(self, value):
+        self.pop_matrix = np.array(value, dtype=self.dtype).reshape(-1, self.n2)
+
+    def chromosome(self, i):
+        return self.pop_matrix[i].tolist()
+
+    def init_population(self, start_idx=0):
+        self.np_rng = np.random.default_rng(random.getrandbits(64))
+        super().init_population(start_idx)
+
+    def replace_worst(self, chroms):
+        """Como no GA em listas, mas escreve só as linhas trocadas da matriz."""
+        worst = np.argsort(np.asarray(self.fitnesses), kind='stable')
+        if not self.pop_matrix.flags.writeable:
+            self.pop_matrix = self.pop_matrix.copy()
+        for i, chrom in zip(worst.tolist(), chroms):
+            chrom = list(chrom)
+            prefix = self.repair(chrom)
+            f, path = self.fitness(chrom, random.Random(random.getrandbits(64)), prefix)
+            self.pop_matrix[i] = chrom
+            self.fitnesses[i] = f
+            if f > self.best_fitness:
+                self.best_fitness, self.best, self.best_path = f, chrom[:], path[:]
+
+    def legal_prefix_lengths(self, mat):
+        """Tamanho do prefixo de movimentos legais de cada linha (linhas são permutações)."""
+        dx = np.abs(np.diff(self._xs[mat], axis=1)); dy = np.abs(np.diff(self._ys[mat], axis=1))
+        ok = (dx * dy) == 2
+        return np.where(ok.all(axis=1), ok.shape[1], ok.argmin(axis=1)) + 1
+
+    def tournament_indices(self, count):
+        cand = self.np_rng.integers(0, len(self.pop_matrix), size=(count, self.tourn))
+        fits = np.asarray(self.fitnesses)
+        return cand[np.arange(count), fits[cand].argmax(axis=1)]
+
+    def edge_recombination_rows(self, p1, p2):
+        """ERX em lote: monta os filhos de todos os pares (p1[i], p2[i]) ao mesmo tempo, uma
+           coluna por iteração. Mesmas regras de edge_recombination_crossover (próximo gene =
+           vizinho restante com menos vizinhos, empate na ordem p1 anterior, p1 seguinte, p2
+           anterior, p2 seguinte; sem vizinho, um gene livre sorteado), com np_rng no sorteio.
+           A tabela de arestas é (m, n2+1, 4); a linha extra n2 é um gene fictício usado como
+           "sem vizinho", para que as atribuições indexadas nunca colidam com um gene real."""
+        m, n2 = p1.shape
+        rows = np.arange(m)
+        adj = np.full((m, n2 + 1, 4), n2, dtype=self.dtype)
+        for slot, (par, shift) in enumerate(((p1, 1), (p1, -1), (p2, 1), (p2, -1))):
+            adj[rows[:, None], par, slot] = np.roll(par, shift, axis=1)
+        # remove arestas repetidas (a mesma adjacência nos dois pais) e laços (n2 == 1)
+        for slot in range(1, 4):
+            dup = (adj[:, :, slot:slot+1] == adj[:, :, :slot]).any(axis=2)
+            adj[:, :, slot][dup] = n2
+        adj[adj == np.arange(n2 + 1)[None, :, None]] = n2
+        alive = adj != n2
+        count = alive.sum(axis=2, dtype=np.int32).ravel()
+        # rev[g, k]: em que posição da lista do vizinho adj[g, k] o gene g aparece (a tabela é
+        # simétrica), para tirar um gene das listas dos vizinhos sem procurá-lo nelas
+        genes = np.arange(n2 + 1)[None, :, None, None]
+        rev = (adj[rows[:, None, None], adj] == genes).argmax(axis=3).astype(np.intp)
+        # índices planos (linha * (n2+1) + gene): bem mais baratos que indexação 2D em cada passo
+        adj = adj.reshape(-1, 4); alive = alive.reshape(-1, 4); rev = rev.reshape(-1, 4)
+        base = rows * (n2 + 1)
+        used = np.zeros((m, n2 + 1), dtype=bool); used[:, n2] = True
+        child = np.empty((m, n2), dtype=self.dtype)
+        cur = p1[:, 0].astype(np.intp)
+        fallbacks = 0
+        for t in range(n2):
+            child[:, t] = cur; used[rows, cur] = True
+            # tira 'cur' das listas dos vizinhos ainda livres (os usados não são mais consultados)
+            gi = base + cur
+            ok = alive[gi]
+            ni = base[:, None] + adj[gi]
+            alive[ni[ok], rev[gi][ok]] = False
+            count[ni[ok]] -= 1
+            if t == n2 - 1: break
+            k = np.where(ok, count[ni], 5).argmin(axis=1)
+            nxt = ni[rows, k] - base
+            stuck = np.flatnonzero(~ok.any(axis=1))
+            if len(stuck):
+                keys = self.np_rng.random((len(stuck), n2 + 1)); keys[used[stuck]] = -1.0
+                nxt[stuck] = keys.argmax(axis=1); fallbacks += len(stuck)
+            cur = nxt
+        if self.profiler is not None: self.profiler.count('crossover_fallbacks', fallbacks)
+        return child
+
+    def mutate_rows(self, mat):
+        """Troca ou inversão (50/50) em cada linha, sem tocar o gene 0."""
+        rows, n2 = mat.shape
+        a = self.np_rng.integers(1, n2, size=rows)
+        b = self.np_rng.integers(1, n2 - 1, size=rows); b += b >= a
+        lo, hi = np.minimum(a, b)[:, None], np.maximum(a, b)[:, None]
+        cols = np.arange(n2)[None, :]
+        swap = (self.np_rng.random(rows) < 0.5)[:, None]
+        src = np.where(swap, np.where(cols == lo, hi, np.where(cols == hi, lo, cols)),
+                       np.where((cols >= lo) & (cols <= hi), lo + hi - cols, cols))
+        return np.take_along_axis(mat, src, axis=1)
+
+    def step(self):
+        prof = self.profiler
+        if prof: prof.start_generation()
+        n2 = self.n2
+        m = self.pop_size - 1
+        parents = self.pop_matrix[self.tournament_indices(2 * m)]
+        if prof: prof.lap('selection')
+        children = self.edge_recombination_rows(parents[0::2], parents[1::2])
+        if prof: prof.lap('crossover')
+        mut = self.np_rng.random(m) < self.mutation_rate
+        if mut.any():
+            children[mut] = self.mutate_rows(children[mut])
+        if prof: prof.lap('mutation')
+        # Reparo só nos filhos cujo prefixo legal não cobre o cromossomo inteiro,
+        # recomeçando do ponto em que o prefixo legal acaba; só essas linhas voltam à matriz
+        lengths = self.legal_prefix_lengths(children).tolist()
+        rows = children.tolist()
+        nxt = self._spare
+        if nxt is None or nxt.shape != (self.pop_size, n2) or not nxt.flags.writeable:   # mmap do checkpoint é só leitura
+            nxt = np.empty((self.pop_size, n2), dtype=self.dtype)
+        nxt[0] = self.best; nxt[1:] = children
+        prefixes = [None]
+        for i, (row, length) in enumerate(zip(rows, lengths)):
+            if length < n2:
+                prefixes.append(self.repair(row, length)); nxt[i + 1] = row
+            else:
+                prefixes.append(row)
+        self._spare, self.pop_matrix = self.pop_matrix, nxt
+        if prof: prof.lap('repair')
+        self.evaluate_all(prefixes, cached={0: (self.best_fitness, self.best_path)}, chroms=[self.best] + rows)
+        self.generation += 1
+        if prof: prof.lap('evaluation'); prof.end_generation(self)
+
+        return self.best_fitness == n2 - 1
+
+# ----------------------------
+# Modelo de ilhas (um processo por subpopulação)
+# ----------------------------
+ISLAND_TOPOLOGIES = ('ring', 'full')
+
+def _pack(chroms, n2):
+    """Lista de cromossomos/caminhos -> bytes de um array de inteiros sem sinal."""
+    return array('H' if n2 <= 1 << 16 else 'I', itertools.chain.from_iterable(chroms)).tobytes()
+
+def _unpack(data, n2):
+    """Inverso de _pack: blocos de n2 inteiros (o último pode ser menor)."""
+    flat = array('H' if n2 <= 1 << 16 else 'I'); flat.frombytes(data)
+    return [flat[i:i+n2].tolist() for i in range(0, len(flat), n2)]
+
+def _island_worker(conn, stop, n, start_idx, seed, ga_args, backend, generations, interval, migrants, deadline,
+                   height=None):
+    """Evolui uma ilha em blocos de 'interval' gerações; entre blocos manda seus melhores
+       indivíduos ao coordenador e recebe os migrantes (ou a ordem de parar)."""
+    random.seed(seed)
+    ga = GA_BACKENDS[backend](n, *ga_args, height=height)
+    n2 = ga.n2
+    ga.init_population(start_idx)
+    solved = ga.best_fitness == n2 - 1
+    while True:
+        for _ in range(interval):
+            if solved or stop.is_set() or ga.generation >= generations or time.time() > deadline:
+                break
+            solved = ga.step()
+        if solved:
+            stop.set()   # avisa as outras ilhas no meio do bloco
+        elite = sorted(range(len(ga.fitnesses)), key=ga.fitnesses.__getitem__, reverse=True)[:migrants]
+        conn.send((ga.generation, ga.best_fitness, _pack([ga.chromosome(i) for i in elite], n2),
+                   array('I', [ga.fitnesses[i] for i in elite]).tobytes(), _pack([ga.best_path], n2)))
+        cmd, data = conn.recv()
+        if cmd == 'stop':
+            conn.send((ga.best_fitness_history, ga.avg_fitness_history))
+            break
+        ga.replace_worst(_unpack(data, n2))
+    ga.close()
+    conn.close()
+
+def run_islands(n, start_idx=0, islands=4, population_size=GA_POP, mutation_rate=GA_MUT_RATE, tourn_size=GA_TOURN,
+                generations=GA_GEN_LIMIT, time_limit=None, migration_interval=20, migrants=5, topology='ring',
+                seed=None, backend='list', height=None):
+    """GA em modelo de ilhas: 'islands' subpopulações evoluem cada uma no seu processo (com o
+       step() de sempre) e a cada 'migration_interval' gerações trocam seus 'migrants' melhores
+       indivíduos pela topologia 'ring' (i recebe de i-1) ou 'full' (i recebe os melhores das
+       demais). Para assim que qualquer ilha acha um passeio completo. height: altura de um
+       tabuleiro retangular (n é a largura).
+       Retorna um dicionário com best_fitness, best_path, solved_by, gerações e históricos por ilha."""
+    if topology not in ISLAND_TOPOLOGIES:
+        raise ValueError(f"Topologia desconhecida: {topology!r} (opções: {', '.join(ISLAND_TOPOLOGIES)})")
+    n2 = n * (n if height is None else height)
+    master = random.Random(seed)
+    deadline = time.time() + time_limit if time_limit is not None else float('inf')
+    stop = multiprocessing.Event()
+    conns, procs = [], []
+    for _ in range(islands):
+        parent, child = multiprocessing.Pipe()
+        proc = multiprocessing.Process(target=_island_worker, daemon=True,
+                                       args=(child, stop, n, start_idx, master.getrandbits(64),
+                                             (population_size, mutation_rate, tourn_size), backend,
+                                             generations, migration_interval, migrants, deadline, height))
+        proc.start()
+        conns.append(parent); procs.append(proc)
+    epochs = 0
+    try:
+        while True:
+            reports = [c.recv() for c in conns]
+            epochs += 1
+            if stop.is_set() or time.time() > deadline or all(r[0] >= generations for r in reports):
+                for c in conns: c.send(('stop', None))
+                histories = [c.recv() for c in conns]
+                break
+            if topology == 'ring':
+                for k, c in enumerate(conns):
+                    c.send(('migrate', reports[k - 1][2]))
+            else:
+                elites = []
+                for r in reports:
+                    fits = array('I'); fits.frombytes(r[3])
+                    elites.append(list(zip(fits, _unpack(r[2], n2))))
+                for k, c in enumerate(conns):
+                    pool = [e for j, el in enumerate(elites) if j != k for e in el]
+                    pool.sort(key=lambda t: t[0], reverse=True)
+                    c.send(('migrate', _pack([ch for _, ch in pool[:migrants]], n2)))
+    finally:
+        for proc in procs:
+            proc.join(timeout=5)
+            if proc.is_alive(): proc.terminate()
+    best = max(range(islands), key=lambda k: reports[k][1])
+    return {'best_fitness': reports[best][1], 'best_path': _unpack(reports[best][4], n2)[0],
+            'solved_by': best if reports[best][1] == n2 - 1 else None, 'epochs': epochs,
+            'generations': [r[0] for r in reports],
+            'best_fitness_history': [h[0] for h in histories], 'avg_fitness_history': [h[1] for h in histories]}
+
+# ----------------------------
+# Checkpoint binário do GA
+# ----------------------------
+CHECKPOINT_MAGIC = b'KTGA'
+CHECKPOINT_VERSION = 1
+_CK_HEADER = struct.Struct('<4sII')   # magic, versão, tamanho do JSON de metadados
+
+def _align8(x): return (x + 7) & ~7
+
+def dump_checkpoint(ga):
+    """Serializa o estado completo do GA (população, aptidões, melhor indivíduo, históricos,
+       geração, estado dos RNGs e do AdaptiveController, se houver) em bytes: metadados JSON
+       curtos + arrays de inteiros empacotados."""
+    n2 = ga.n2
+    gene = 'H' if n2 <= 1 << 16 else 'I'
+    if NUMPY_AVAILABLE and isinstance(ga, ArrayGeneticKnightTour):
+        population = array(gene); population.frombytes(ga.pop_matrix.astype('<u2' if gene == 'H' else '<u4').tobytes())
+    else:
+        population = array(gene, itertools.chain.from_iterable(ga.population))
+    rng_version, rng_internal, rng_gauss = random.getstate()
+    sections = [('population', population), ('fitnesses', array('I', ga.fitnesses)),
+                ('best', array(gene, ga.best or [])), ('best_path', array(gene, ga.best_path or [])),
+                ('best_fitness_history', array('i', ga.best_fitness_history)),
+                ('avg_fitness_history', array('d', ga.avg_fitness_history)),
+                ('random_state', array('I', rng_internal))]
+    meta = {'backend': next(k for k, cls in GA_BACKENDS.items() if type(ga) is cls),
+            'n': ga.n, 'height': ga.h, 'pop_size': ga.pop_size, 'mutation_rate': ga.mutation_rate, 'tourn': ga.tourn,
+            'generation': ga.generation, 'best_fitness': ga.best_fitness, 'byteorder': sys.byteorder,
+            'random_version': rng_version, 'random_gauss': rng_gauss, 'sections': {}}
+    if NUMPY_AVAILABLE and isinstance(ga, ArrayGeneticKnightTour):
+        meta['np_rng_state'] = ga.np_rng.bit_generator.state
+    if ga.controller is not None:
+        meta['controller'] = ga.controller.state()
+    offset = 0
+    for name, arr in sections:
+        meta['sections'][name] = [offset, arr.typecode, len(arr)]
+        offset = _align8(offset + len(arr) * arr.itemsize)
+    meta_bytes = json.dumps(meta).encode('utf-8')
+    base = _align8(_CK_HEADER.size + len(meta_bytes))
+    out = bytearray(base + offset)
+    _CK_HEADER.pack_into(out, 0, CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(meta_bytes))
+    out[_CK_HEADER.size:_CK_HEADER.size + len(meta_bytes)] = meta_bytes
+    for name, arr in sections:
+        start = base + meta['sections'][name][0]
+        out[start:start + len(arr) * arr.itemsize] = arr.tobytes()
+    return bytes(out)
+
+def _atomic_write(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)   # quem lê nunca vê um arquivo pela metade
+
+def save_checkpoint(ga, path):
+    """Grava o checkpoint de forma atômica (síncrono)."""
+    _atomic_write(path, dump_checkpoint(ga))
+
+def load_checkpoint(path, workers=1, restore_rng=True):
+    """Reconstrói o GA a partir de um checkpoint. O arquivo é mapeado em memória; no backend
+       'array' a população fica como visão direta do mapeamento (sem cópia).
+       Com restore_rng, o estado dos RNGs também volta e a continuação é idêntica à original.
+       O estado do AdaptiveController, se o checkpoint tiver um, fica em ga.controller_state."""
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, meta_len = _CK_HEADER.unpack_from(mm, 0)
+    if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+        raise ValueError(f"{path}: não é um checkpoint do GA (versão {CHECKPOINT_VERSION})")
+    meta = json.loads(mm[_CK_HEADER.size:_CK_HEADER.size + meta_len].decode('utf-8'))
+    base = _align8(_CK_HEADER.size + meta_len)
+    swap = meta['byteorder'] != sys.byteorder
+
+    def section(name):
+        offset, code, count = meta['sections'][name]
+        arr = array(code)
+        arr.frombytes(mm[base + offset:base + offset + count * arr.itemsize])
+        if swap: arr.byteswap()
+        return arr
+
+    n, pop_size = meta['n'], meta['pop_size']
+    ga = GA_BACKENDS[meta['backend']](n, pop_size, meta['mutation_rate'], meta['tourn'], workers=workers,
+                                      height=meta.get('height'))
+    n2 = ga.n2
+    offset, code, count = meta['sections']['population']
+    mapped = False   # população apontando direto para o mmap (mantém o arquivo mapeado)
+    if meta['backend'] == 'array' and not swap:
+        stored = np.dtype('<u2' if code == 'H' else '<u4')
+        view = np.frombuffer(mm, dtype=stored, count=count, offset=base + offset).reshape(pop_size, n2)
+        mapped = stored.itemsize == np.dtype(ga.dtype).itemsize
+        ga.pop_matrix = view.view(ga.dtype) if mapped else view.astype(ga.dtype)
+    else:
+        flat = section('population')
+        ga.population = [flat[i:i+n2].tolist() for i in range(0, len(flat), n2)]
+    ga.fitnesses = section('fitnesses').tolist()
+    ga.best = section('best').tolist() or None
+    ga.best_path = section('best_path').tolist() or None
+    ga.best_fitness = meta['best_fitness']
+    ga.best_fitness_history = section('best_fitness_history').tolist()
+    ga.avg_fitness_history = section('avg_fitness_history').tolist()
+    ga.generation = meta['generation']
+    ga.controller_state = meta.get('controller')
+    if restore_rng:
+        random.setstate((meta['random_version'], tuple(section('random_state')), meta['random_gauss']))
+        if 'np_rng_state' in meta:
+            ga.np_rng.bit_generator.state = meta['np_rng_state']
+    if not mapped:
+        mm.close()
+    return ga
+
+class Checkpointer:
+    """Checkpoints periódicos sem travar a evolução: o estado é serializado na thread
+       principal (rápido, arrays empacotados) e gravado em disco numa thread de fundo."""
+    def __init__(self, path, every=50):
+        self.path = path
+        self.every = every
+        self._thread = None
+        self._error = None
+
+    def maybe_save(self, ga, force=False):
+        if not force and (self.every <= 0 or ga.generation % self.every):
+            return False
+        data = dump_checkpoint(ga)
+        self.wait()
+        self._thread = threading.Thread(target=self._write, args=(data,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _write(self, data):
+        try:
+            _atomic_write(self.path, data)
+        except OSError as e:
+            self._error = e
+
+    def wait(self):
+        """Espera a gravação em andamento; repassa o erro dela, se houver."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise err
+
+# ----------------------------
+# API de execução (sem GUI)
+# ----------------------------
+SOLVERS = ('warnsdorff', 'backtracking', 'ga', 'divide', 'islands')
+CACHED_SOLVERS = ('warnsdorff', 'backtracking', 'divide')
+GA_BACKENDS = {'list': GeneticKnightTour, 'array': ArrayGeneticKnightTour}
+
+def run_ga(n, start_idx=0, population_size=GA_POP, mutation_rate=GA_MUT_RATE, tourn_size=GA_TOURN,
+           generations=GA_GEN_LIMIT, time_limit=None, workers=GA_WORKERS, backend='list',
+           checkpoint=None, checkpoint_every=50, resume=None, profile=False, adaptive=False, height=None):
+    """Roda o GA até achar um passeio completo, esgotar as gerações ou o tempo (height: altura
+       de um tabuleiro retangular; n é a largura).
+       checkpoint: arquivo gravado a cada checkpoint_every gerações (e no fim);
+       resume: checkpoint do qual continuar (ignora os parâmetros de população);
+       profile: True instala um GAProfiler em ga.profiler; um caminho também exporta
+       os registros por geração no fim (CSV se terminar em .csv, senão JSON);
+       adaptive: True (ou um dict de parâmetros) liga o AdaptiveController, que pode
+       encerrar a execução antes do limite de gerações quando o GA estagna; com resume,
+       o controlador retoma o estado gravado no checkpoint (os parâmetros vêm de 'adaptive').
+       Retorna a instância (com best_path, histórico etc.) já com o pool fechado."""
+    start = time.perf_counter()
+    if resume:
+        ga = load_checkpoint(resume, workers=workers)
+    else:
+        ga = GA_BACKENDS[backend](n, population_size, mutation_rate, tourn_size, workers=workers, height=height)
+    if profile:
+        ga.profiler = GAProfiler()
+    if adaptive:
+        ga.controller = AdaptiveController(ga, **(adaptive if isinstance(adaptive, dict) else {}),
+                                           state=ga.controller_state)
+    saver = Checkpointer(checkpoint, checkpoint_every) if checkpoint else None
+    try:
+        if not resume:
+            ga.init_population(start_idx)
+        solved = ga.best_fitness == ga.n2 - 1
+        while not solved and ga.generation < generations:
+            if time_limit is not None and time.perf_counter() - start > time_limit:
+                break
+            solved = ga.step()
+            stop = ga.controller is not None and not solved and ga.controller.update(generations)
+            if saver: saver.maybe_save(ga)   # depois do controlador: o checkpoint já inclui a reação dele
+            if stop:
+                break
+        if saver: saver.maybe_save(ga, force=True)
+    finally:
+        ga.close()
+        if saver: saver.wait()
+    if isinstance(profile, str):
+        ga.profiler.export(profile)
+    return ga
+
+def solve(solver, n=BOARD_SIZE, start_idx=0, seed=None, time_limit=None, generations=GA_GEN_LIMIT, closed=False,
+          cache=None, symmetric=False, height=None, **ga_options):
+    """Executa um dos SOLVERS e devolve um dicionário serializável em JSON com o resultado.
+       'closed' só vale para 'divide' (pede um passeio fechado); ga_options vão para
+       run_ga ('ga') ou run_islands ('islands'). Com um 'cache' (TourCache), os solvers
+       determinísticos respondem direto do cache quando possível e todo passeio completo
+       encontrado é guardado nele; GA e ilhas só gravam, para não pular a evolução.
+       Com symmetric=True o solver roda na casa canônica de start_idx e o caminho é
+       transformado de volta (o resultado ganha 'canonical_start' e 'symmetry').
+       height: altura de um tabuleiro retangular (n é a largura); o resultado traz 'height'."""
+    h = n if height is None else height
+    if solver not in SOLVERS:
+        raise ValueError(f"Solver desconhecido: {solver!r} (opções: {', '.join(SOLVERS)})")
+    if not 0 <= start_idx < n * h:
+        raise ValueError(f"Casa inicial {start_idx} fora do tabuleiro {n}x{h}")
+    if symmetric:
+        canon, k = canonical_start(start_idx, n, h)
+        result = solve(solver, n, canon, seed, time_limit, generations, closed, cache, height=height, **ga_options)
+        return _mapped_result(result, start_idx, SYMMETRY_INVERSE[k])
+    if seed is not None:
+        random.seed(seed)
+    result = {'solver': solver, 'n': n, 'height': h, 'start_idx': start_idx, 'seed': seed}
+    start = time.perf_counter()
+    path = None
+    if cache is not None and solver in CACHED_SOLVERS:
+        path = cache.get(n, h, start_idx, closed=closed)
+    result['cached'] = path is not None
+    if path is None:
+        if solver == 'warnsdorff':
+            path = warnsdorff_tour(n, start_idx, height=height)
+        elif solver == 'backtracking':
+            stats = {}
+            path = backtracking_tour(n, start_idx, time_limit=5.0 if time_limit is None else time_limit, stats=stats,
+                                     height=height) or []
+            result.update(nodes=stats['nodes'], nodes_per_sec=stats['nodes_per_sec'], timed_out=stats['timed_out'])
+        elif solver == 'divide':
+            path = divide_conquer_tour(n, start_idx, closed=closed, height=height) or []
+            result['closed'] = closed
+        elif solver == 'islands':
+            res = run_islands(n, start_idx, generations=generations, time_limit=time_limit, seed=seed, height=height,
+                              **ga_options)
+            path = res['best_path']
+            result.update(generations=res['generations'], best_fitness=res['best_fitness'], solved_by=res['solved_by'],
+                          epochs=res['epochs'], best_fitness_history=res['best_fitness_history'])
+        else:
+            ga = run_ga(n, start_idx, generations=generations, time_limit=time_limit, height=height, **ga_options)
+            path = ga.best_path or []
+            result.update(generations=ga.generation, best_fitness=ga.best_fitness,
+                          best_fitness_history=ga.best_fitness_history)
+            if ga.profiler is not None:
+                result['profile'] = ga.profiler.summary()
+            if ga.controller is not None:
+                result.update(stopped_early=ga.controller.stopped_early, restarts=ga.controller.total_restarts,
+                              final_mutation_rate=ga.mutation_rate, final_tourn=ga.tourn)
+    result['elapsed'] = time.perf_counter() - start
+    if cache is not None and not result['cached'] and len(path) == n * h:
+        cache.put(n, h, path)
+    result['complete'] = len(path) == n * h
+    result['length'] = len(path)
+    result['path'] = path
+    return result
+
+def _mapped_result(result, start_idx, k):
+    """Resultado da casa canônica reescrito para start_idx pela simetria k."""
+    res = dict(result, start_idx=start_idx, canonical_start=result['start_idx'], symmetry=k)
+    if k:
+        res['path'] = transform_path(result['path'], k, result['n'], result['height'])
+    return res
+
+def solve_all_starts(solver, n=BOARD_SIZE, height=None, **options):
+    """Modo "todas as casas": resolve só as casas canônicas (canonical_starts) e gera um
+       resultado por casa do tabuleiro, agrupado por classe de simetria. Os resultados das
+       casas não canônicas repetem 'elapsed' da canônica, que foi quem de fato rodou.
+       Em tabuleiros retangulares sobram 4 simetrias, então ~n*h/4 casas são resolvidas."""
+    for canon, members in start_orbits(n, height).items():
+        result = solve(solver, n, canon, height=height, **options)
+        for i, k in members:
+            yield _mapped_result(result, i, k)
+
+# ----------------------------
+# Execução em segundo plano (para interfaces)
+# ----------------------------
+class SolverWorker:
+    """Roda um job numa thread e publica snapshots numa fila. O job é uma função
+       job(checkpoint) que devolve um iterável de snapshots (dicts); checkpoint() bloqueia
+       enquanto o worker está pausado e retorna True depois de cancel(). O último snapshot
+       publicado repete os campos do último snapshot do job e acrescenta 'done': True (e
+       'cancelled' / 'error' quando for o caso): ele pode chegar sozinho num latest(), depois
+       que a interface já consumiu o anterior."""
+    def __init__(self, job):
+        self.snapshots = queue.Queue()
+        self._running = threading.Event(); self._running.set()
+        self._cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._main, args=(job,), daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _main(self, job):
+        final = {}
+        try:
+            for snap in job(self.checkpoint):
+                self.snapshots.put(snap)
+                final = dict(snap)
+                if self.checkpoint(): break
+        except Exception as e:
+            final['error'] = e
+        final.update(done=True, cancelled=self._cancelled.is_set())
+        self.snapshots.put(final)
+
+    def checkpoint(self):
+        self._running.wait()
+        return self._cancelled.is_set()
+
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def pause(self): self._running.clear()
+
+    def resume(self): self._running.set()
+
+    def cancel(self):
+        self._cancelled.set(); self._running.set()
+
+    @property
+    def paused(self): return not self._running.is_set()
+
+    def latest(self):
+        """Esvazia a fila e junta tudo num único snapshot (os campos mais recentes vencem),
+           para a interface desenhar só o estado atual; None se não houver nada novo."""
+        merged = None
+        while True:
+            try: snap = self.snapshots.get_nowait()
+            except queue.Empty: return merged
+            merged = snap if merged is None else {**merged, **snap}
@@ -0,0 +1,163 @@
+"""
+knight_tour_bench.py
+Benchmark reprodutível dos solvers: varre tamanhos de tabuleiro, casas iniciais, sementes
+e parâmetros do GA (população, mutação, torneio), mede tempo, gerações até a solução,
+taxa de sucesso, avaliações por segundo e pico de memória, grava tudo em JSON e
+compara com um baseline salvo (código de saída 1 se houver regressão).
+
+Exemplos:
+    python knight_tour_bench.py --solvers warnsdorff --sizes 5-50 -o bench.json
+    python knight_tour_bench.py --solvers ga --sizes 6,8 --starts 4 --seeds 3 --pop 100,250 --mut 0.1,0.15
+    python knight_tour_bench.py --solvers warnsdorff,backtracking --sizes 5-8 --baseline bench.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from knight_tour import GA_POP, GA_GEN_LIMIT, GA_TOURN, GA_MUT_RATE, SOLVERS, canonical_starts, solve
+
+def parse_int_list(text):
+    """'5,6,8' ou '5-12' (ou combinações, '5-8,10,12') -> lista de inteiros."""
+    values = []
+    for part in text.split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            values.extend(range(int(lo), int(hi) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+def parse_float_list(text):
+    return [float(v) for v in text.split(",")]
+
+def start_squares(n, spec, rng):
+    """'all' = todas as casas; 'canonical' = uma casa por classe de simetria (~n²/8);
+       um inteiro k = amostra fixa de k casas."""
+    if spec == "all":
+        return list(range(n * n))
+    if spec == "canonical":
+        return canonical_starts(n)
+    return sorted(rng.sample(range(n * n), min(int(spec), n * n)))
+
+def config_key(rec):
+    key = f"{rec['solver']}/n={rec['n']}"
+    if rec['solver'] == 'ga':
+        key += f"/pop={rec['pop']}/mut={rec['mut']}/tourn={rec['tourn']}"
+    return key
+
+def run_case(solver, n, start_idx, seed, params, args):
+    ga_options = {}
+    if solver == 'ga':
+        ga_options = dict(population_size=params['pop'], mutation_rate=params['mut'], tourn_size=params['tourn'],
+                          workers=args.workers, backend=args.backend)
+    res = solve(solver, n, start_idx, seed=seed, time_limit=args.time_limit, generations=args.generations, **ga_options)
+    rec = {'solver': solver, 'n': n, 'start_idx': start_idx, 'seed': seed, **params,
+           'elapsed': res['elapsed'], 'complete': res['complete'], 'length': res['length']}
+    if solver == 'ga':
+        rec['generations'] = res['generations']
+        rec['evals_per_sec'] = params['pop'] * (res['generations'] + 1) / res['elapsed'] if res['elapsed'] > 0 else None
+    if args.memory:
+        # segunda execução idêntica só para medir o pico (tracemalloc distorce o tempo)
+        tracemalloc.start()
+        solve(solver, n, start_idx, seed=seed, time_limit=args.time_limit, generations=args.generations, **ga_options)
+        rec['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return rec
+
+def summarize(records):
+    groups = {}
+    for rec in records:
+        groups.setdefault(config_key(rec), []).append(rec)
+    summary = {}
+    for key, recs in groups.items():
+        times = [r['elapsed'] for r in recs]
+        solved = [r for r in recs if r['complete']]
+        row = {'runs': len(recs), 'success_rate': len(solved) / len(recs),
+               'median_time': statistics.median(times), 'mean_time': statistics.fmean(times), 'max_time': max(times)}
+        if recs[0]['solver'] == 'ga':
+            row['mean_generations_to_solution'] = statistics.fmean(r['generations'] for r in solved) if solved else None
+            eps = [r['evals_per_sec'] for r in recs if r['evals_per_sec']]
+            row['evals_per_sec'] = statistics.fmean(eps) if eps else None
+        if 'peak_memory' in recs[0]:
+            row['peak_memory'] = max(r['peak_memory'] for r in recs)
+        summary[key] = row
+    return summary
+
+def compare(summary, baseline, tolerance):
+    """Lista de regressões: tempo mediano acima de (1+tolerance)x o baseline ou queda na taxa de sucesso."""
+    regressions = []
+    for key, row in summary.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        ratio = row['median_time'] / old['median_time'] if old['median_time'] > 0 else 1.0
+        row['baseline_ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(f"{key}: tempo mediano {ratio:.2f}x o baseline")
+        if row['success_rate'] < old['success_rate']:
+            regressions.append(f"{key}: sucesso {row['success_rate']:.0%} (baseline {old['success_rate']:.0%})")
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark dos solvers do Passeio do Cavalo.")
+    parser.add_argument("--solvers", default="warnsdorff", help=f"lista separada por vírgulas ({','.join(SOLVERS)})")
+    parser.add_argument("--sizes", type=parse_int_list, default=parse_int_list("5-8"), help="ex.: 5-50 ou 6,8,12")
+    parser.add_argument("--starts", default="all", help="'all', 'canonical' ou quantidade de casas sorteadas por tabuleiro")
+    parser.add_argument("--seeds", type=int, default=1, help="sementes 0..k-1 por caso")
+    parser.add_argument("--pop", type=parse_int_list, default=[GA_POP])
+    parser.add_argument("--mut", type=parse_float_list, default=[GA_MUT_RATE])
+    parser.add_argument("--tourn", type=parse_int_list, default=[GA_TOURN])
+    parser.add_argument("--generations", type=int, default=GA_GEN_LIMIT)
+    parser.add_argument("--time-limit", type=float, default=None, help="orçamento por execução (s)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--backend", default="list")
+    parser.add_argument("--memory", action="store_true", help="mede o pico de memória (execução extra com tracemalloc)")
+    parser.add_argument("--baseline", help="JSON de um benchmark anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="folga de tempo antes de acusar regressão")
+    parser.add_argument("--output", "-o", help="arquivo JSON de saída")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    solvers = args.solvers.split(",")
+    for s in solvers:
+        if s not in SOLVERS:
+            parser.error(f"solver desconhecido: {s}")
+    rng = random.Random(0)  # amostra de casas iniciais fixa entre execuções do benchmark
+    records = []
+    for solver in solvers:
+        grid = [dict(pop=p, mut=m, tourn=t) for p, m, t in itertools.product(args.pop, args.mut, args.tourn)] if solver == 'ga' else [{}]
+        for n in args.sizes:
+            starts = start_squares(n, args.starts, rng)
+            for params, start_idx, seed in itertools.product(grid, starts, range(args.seeds)):
+                records.append(run_case(solver, n, start_idx, seed, params, args))
+    summary = summarize(records)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(summary, json.load(f)['summary'], args.tolerance)
+
+    for key, row in summary.items():
+        extra = f"  {row['baseline_ratio']:.2f}x baseline" if 'baseline_ratio' in row else ""
+        print(f"{key:45s} runs={row['runs']:5d} sucesso={row['success_rate']:6.1%} mediana={row['median_time']*1000:9.2f}ms{extra}")
+    for msg in regressions:
+        print("REGRESSÃO:", msg)
+
+    if args.output:
+        report = {'created': time.strftime("%Y-%m-%dT%H:%M:%S"), 'argv': sys.argv[1:] if argv is None else argv,
+                  'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+                  'summary': summary, 'records': records, 'regressions': regressions}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+knight_tour_cache.py
+Banco de passeios já resolvidos, chaveado por (largura, altura, casa inicial, fechado).
+Os passeios ficam num SQLite em disco como saltos de 3 bits (encode_moves) e só para a
+casa canônica de cada classe de simetria: um passeio guardado responde por todas as
+casas equivalentes. Na frente do disco há um LRU em memória com os caminhos prontos.
+"""
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from knight_tour import (canonical_start, transform_path, SYMMETRY_INVERSE,
+                         encode_moves, decode_moves, is_valid_tour)
+
+TOUR_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".knight_tour", "tours.sqlite")
+
+class TourCache:
+    """Cache persistente de passeios. path=None mantém o banco só em memória."""
+    def __init__(self, path=TOUR_CACHE_PATH, maxsize=256):
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.maxsize = maxsize
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute("""CREATE TABLE IF NOT EXISTS tours (
+                              width INTEGER, height INTEGER, start INTEGER, closed INTEGER,
+                              length INTEGER, moves BLOB,
+                              PRIMARY KEY (width, height, start, closed))""")
+        self._db.commit()
+        self.hits = self.misses = 0
+
+    def _remember(self, key, path):
+        self._lru[key] = tuple(path)
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def get(self, w, h, start_idx, closed=False):
+        """Passeio completo a partir de start_idx (lista nova) ou None. Pedidos de passeio
+           aberto também são atendidos por passeios fechados guardados."""
+        with self._lock:
+            for want in ((True,) if closed else (False, True)):
+                key = (w, h, start_idx, want)
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return list(self._lru[key])
+            canon, k = canonical_start(start_idx, w, h)
+            for want in ((True,) if closed else (False, True)):
+                row = self._db.execute("SELECT length, moves FROM tours WHERE width=? AND height=? AND start=? AND closed=?",
+                                       (w, h, canon, int(want))).fetchone()
+                if row is not None:
+                    path = transform_path(decode_moves(canon, row[1], row[0] - 1, w), SYMMETRY_INVERSE[k], w, h)
+                    self._remember((w, h, start_idx, want), path)
+                    self.hits += 1
+                    return path
+            self.misses += 1
+            return None
+
+    def put(self, w, h, path):
+        """Guarda um passeio depois de verificá-lo; retorna False se ele não for um passeio completo."""
+        if not is_valid_tour(path, w, h):
+            return False
+        closed = is_valid_tour(path, w, h, closed=True)
+        canon, k = canonical_start(path[0], w, h)
+        stored = transform_path(path, k, w, h)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO tours VALUES (?, ?, ?, ?, ?, ?)",
+                             (w, h, canon, int(closed), len(stored), encode_moves(stored, w)))
+            self._db.commit()
+            self._remember((w, h, path[0], closed), path)
+        return True
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,124 @@
+"""
+knight_tour_cli.py
+Execução headless do Passeio do Cavalo: roda qualquer solver sem importar tkinter,
+matplotlib ou sv_ttk e emite os resultados em JSON (uma linha por execução).
+
+Exemplos:
+    python knight_tour_cli.py --solver warnsdorff --size 50
+    python knight_tour_cli.py --solver divide --size 1000 --closed --no-path
+    python knight_tour_cli.py --solver ga --size 8 --start 27 --seed 1 --runs 100 --time-limit 10
+    python knight_tour_cli.py --solver ga --size 12 --checkpoint run.ckpt --checkpoint-every 100
+    python knight_tour_cli.py --solver ga --size 12 --resume run.ckpt --checkpoint run.ckpt
+    python knight_tour_cli.py --solver ga --size 14 --adaptive --generations 2000 --no-path
+    python knight_tour_cli.py --solver ga --size 16 --seed 1 --generations 100 --profile perfil.csv --no-path
+    python knight_tour_cli.py --solver islands --size 12 --islands 8 --topology full --pop 200 --seed 1
+    python knight_tour_cli.py --solver backtracking --size 8 --start 63 --cache
+    python knight_tour_cli.py --solver backtracking --size 7 --all-starts --no-path
+    python knight_tour_cli.py --solver warnsdorff --size 1000 --height 3 --compact
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+
+from knight_tour import (BOARD_SIZE, GA_POP, GA_GEN_LIMIT, GA_TOURN, GA_MUT_RATE, GA_WORKERS,
+                         GA_BACKENDS, ISLAND_TOPOLOGIES, SOLVERS, encode_moves, solve, solve_all_starts)
+from knight_tour_cache import TOUR_CACHE_PATH, TourCache
+from knight_tour_validate import tour_violation
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Resolve o Passeio do Cavalo sem interface gráfica.")
+    parser.add_argument("--solver", choices=SOLVERS, default="warnsdorff")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE, help="lado do tabuleiro (n x n) ou largura com --height")
+    parser.add_argument("--height", type=int, default=None, help="altura de um tabuleiro retangular (padrão: --size)")
+    parser.add_argument("--start", type=int, default=0, help="índice da casa inicial (y*largura + x)")
+    parser.add_argument("--seed", type=int, default=None, help="semente; a execução i usa seed+i")
+    parser.add_argument("--runs", type=int, default=1, help="quantidade de execuções")
+    parser.add_argument("--time-limit", type=float, default=None, help="orçamento de tempo por execução (s)")
+    parser.add_argument("--symmetric", action="store_true", help="resolve a casa canônica equivalente e transforma o caminho")
+    parser.add_argument("--all-starts", action="store_true",
+                        help="todas as casas iniciais, resolvendo só as canônicas (~n²/8) e ignorando --start")
+    parser.add_argument("--closed", action="store_true", help="pede passeio fechado (solver divide)")
+    parser.add_argument("--generations", type=int, default=GA_GEN_LIMIT, help="limite de gerações do GA")
+    parser.add_argument("--pop", type=int, default=GA_POP, help="tamanho da população do GA")
+    parser.add_argument("--mut", type=float, default=GA_MUT_RATE, help="taxa de mutação do GA")
+    parser.add_argument("--tourn", type=int, default=GA_TOURN, help="tamanho do torneio do GA")
+    parser.add_argument("--workers", type=int, default=GA_WORKERS, help="processos para a aptidão do GA")
+    parser.add_argument("--checkpoint", help="arquivo de checkpoint do GA (gravado periodicamente)")
+    parser.add_argument("--checkpoint-every", type=int, default=50, help="gerações entre checkpoints")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="GA adaptativo: mais mutação/torneio em platôs, reinícios parciais e parada antecipada")
+    parser.add_argument("--stagnation-window", type=int, default=50, help="gerações sem melhora por janela (--adaptive)")
+    parser.add_argument("--profile", metavar="ARQUIVO",
+                        help="mede fases e contadores do GA e grava os registros por geração (.csv ou .json)")
+    parser.add_argument("--resume", help="continua o GA a partir deste checkpoint")
+    parser.add_argument("--islands", type=int, default=4, help="quantidade de ilhas (solver islands)")
+    parser.add_argument("--migration-interval", type=int, default=20, help="gerações entre migrações")
+    parser.add_argument("--migrants", type=int, default=5, help="indivíduos enviados por migração")
+    parser.add_argument("--topology", choices=ISLAND_TOPOLOGIES, default="ring", help="topologia de migração")
+    parser.add_argument("--backend", choices=sorted(GA_BACKENDS), default="list", help="representação da população")
+    parser.add_argument("--cache", nargs="?", const=TOUR_CACHE_PATH, default=None, metavar="ARQUIVO",
+                        help=f"consulta/grava passeios num banco SQLite (padrão: {TOUR_CACHE_PATH})")
+    parser.add_argument("--no-path", action="store_true", help="omite o caminho no JSON")
+    parser.add_argument("--compact", action="store_true",
+                        help="grava o caminho como 'moves' (base64 dos códigos de 3 bits por salto) em vez da lista de casas")
+    parser.add_argument("--output", "-o", default="-", help="arquivo de saída (JSON Lines); '-' = stdout")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    height = args.size if args.height is None else args.height
+    if args.size < 1 or height < 1 or not 0 <= args.start < args.size * height:
+        parser.error(f"casa inicial {args.start} fora do tabuleiro {args.size}x{height}")
+    ga_options = {}
+    if args.solver == 'ga':
+        ga_options = dict(population_size=args.pop, mutation_rate=args.mut, tourn_size=args.tourn,
+                          workers=args.workers, backend=args.backend, checkpoint=args.checkpoint,
+                          checkpoint_every=args.checkpoint_every, resume=args.resume,
+                          adaptive={'window': args.stagnation_window} if args.adaptive else False)
+    elif args.solver == 'islands':
+        ga_options = dict(population_size=args.pop, mutation_rate=args.mut, tourn_size=args.tourn,
+                          backend=args.backend, islands=args.islands, migration_interval=args.migration_interval,
+                          migrants=args.migrants, topology=args.topology)
+    cache = TourCache(args.cache) if args.cache else None
+    invalid = 0
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for i in range(args.runs):
+            seed = None if args.seed is None else args.seed + i
+            if args.solver == 'ga' and args.profile:
+                # uma exportação por execução: perfil.csv, perfil.1.csv, perfil.2.csv...
+                root, ext = os.path.splitext(args.profile)
+                ga_options['profile'] = args.profile if i == 0 else f"{root}.{i}{ext}"
+            options = dict(seed=seed, time_limit=args.time_limit, generations=args.generations, closed=args.closed,
+                           cache=cache, height=args.height, **ga_options)
+            if args.all_starts:
+                results = solve_all_starts(args.solver, args.size, **options)
+            else:
+                results = [solve(args.solver, args.size, args.start, symmetric=args.symmetric, **options)]
+            for result in results:
+                # todo caminho é conferido antes de sair; violações vão no JSON e no código de saída
+                violation = tour_violation(result['path'], args.size, args.height, closed=result.get('closed', False),
+                                           complete=result['complete']) if result['path'] else None
+                if violation:
+                    result['violation'] = violation; invalid += 1
+                if args.no_path:
+                    del result['path']
+                elif args.compact:
+                    # casa inicial = path_start; decodifique com decode_moves(path_start, moves, len - 1, n)
+                    path = result.pop('path')
+                    result.update(path_start=path[0] if path else None, path_len=len(path),
+                                  moves=base64.b64encode(encode_moves(path, args.size)).decode('ascii'))
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if cache is not None:
+            cache.close()
+    return 1 if invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
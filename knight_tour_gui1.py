@@ -5,11 +5,16 @@ e visualização interativa da heurística de Warnsdorff.
 """
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import random
 import time
-from copy import deepcopy
+import sqlite3
 from tkinter import messagebox
 
+from knight_tour import (BOARD_SIZE, GA_POP, GA_TOURN, GA_MUT_RATE, GA_GEN_LIMIT, GA_WORKERS,
+                         inbound, idx_to_xy, xy_to_idx, get_topology,
+                         warnsdorff_tour, backtracking_tour, divide_conquer_tour, GeneticKnightTour, GAProfiler, AdaptiveController, SolverWorker)
+from knight_tour_cache import TourCache
+from knight_tour_validate import tour_violation
+
 try:
     import matplotlib.pyplot as plt
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -19,311 +24,51 @@ except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
 # ----------------------------
-# Configurações Globais
+# Configurações da GUI
 # ----------------------------
-BOARD_SIZE = 8
-GA_POP = 250
-GA_GEN_LIMIT = 2000
-GA_TOURN = 3
-GA_MUT_RATE = 0.15
 ANIMATION_DELAY = 100
+BOARD_HEIGHT = BOARD_SIZE  # linhas do tabuleiro (diferente de BOARD_SIZE = tabuleiro retangular)
+FRAME_INTERVAL = 33  # ms entre leituras da fila do worker (~30 quadros/s)
+PLOT_POINTS = 400    # pontos por curva no gráfico do GA, qualquer que seja o número de gerações
 
 # ----------------------------
-# Funções de Lógica do Passeio (sem alterações)
+# Histórico decimado para o gráfico
 # ----------------------------
-KNIGHT_MOVES = [(2,1),(1,2),(-1,2),(-2,1),(-2,-1),(-1,-2),(1,-2),(2,-1)]
-def inbound(x,y,n): return 0 <= x < n and 0 <= y < n
-def idx_to_xy(i,n): return (i % n, i // n)
-def xy_to_idx(x,y,n): return y * n + x
-def legal_knight_move(a,b,n):
-    ax,ay = idx_to_xy(a,n); bx,by = idx_to_xy(b,n)
-    return (abs(ax-bx), abs(ay-by)) in [(1,2),(2,1)]
-def random_knight_walk(n, start_idx=0):
-    """Gera um passeio aleatório de cavalo sem repetir casas (pode não cobrir o tabuleiro todo)."""
-    seen = set([start_idx])
-    path = [start_idx]
-    x, y = idx_to_xy(start_idx, n)
-    while True:
-        moves = []
-        for dx, dy in KNIGHT_MOVES:
-            nx, ny = x + dx, y + dy
-            if inbound(nx, ny, n):
-                idx = xy_to_idx(nx, ny, n)
-                if idx not in seen:
-                    moves.append(idx)
-        if not moves:
-            break
-        nxt = random.choice(moves)
-        path.append(nxt)
-        seen.add(nxt)
-        x, y = idx_to_xy(nxt, n)
-    return path  # pode ter < n*n
-def randomized_warnsdorff_extend(n, path):
-    """Tenta estender 'path' (lista de índices) sem repetir casas,
-    usando Warnsdorff com desempate aleatório."""
-    visited = set(path)
-    cur = path[-1]
-    while True:
-        x, y = idx_to_xy(cur, n)
-        candidates = []
-        for dx, dy in KNIGHT_MOVES:
-            nx, ny = x + dx, y + dy
-            if inbound(nx, ny, n):
-                idx = xy_to_idx(nx, ny, n)
-                if idx not in visited:
-                    # grau de liberdade do próximo passo
-                    deg = 0
-                    for dx2, dy2 in KNIGHT_MOVES:
-                        nnx, nny = nx + dx2, ny + dy2
-                        if inbound(nnx, nny, n):
-                            j = xy_to_idx(nnx, nny, n)
-                            if j not in visited:
-                                deg += 1
-                    candidates.append((deg, idx))
-        if not candidates:
-            break
-        # Warnsdorff: escolhe menor grau, porém aleatoriza entre empates
-        min_deg = min(d for d, _ in candidates)
-        pool = [idx for d, idx in candidates if d == min_deg]
-        nxt = random.choice(pool)
-        path.append(nxt)
-        visited.add(nxt)
-        cur = nxt
-    return path
-
-def warnsdorff_tour(n, start_idx=0):
-    x0,y0 = idx_to_xy(start_idx,n); board = [[-1]*n for _ in range(n)]; path = []
-    def degree(x,y):
-        d=0
-        for dx,dy in KNIGHT_MOVES:
-            nx,ny = x+dx, y+dy
-            if inbound(nx,ny,n) and board[ny][nx] == -1: d += 1
-        return d
-    x,y = x0,y0; board[y][x] = 0; path.append(xy_to_idx(x,y,n))
-    for step in range(1,n*n):
-        moves = []
-        for dx,dy in KNIGHT_MOVES:
-            nx,ny = x+dx, y+dy
-            if inbound(nx,ny,n) and board[ny][nx] == -1: moves.append((degree(nx,ny),(nx,ny)))
-        if not moves: return path
-        moves.sort(key=lambda t: t[0])
-        x,y = moves[0][1]; board[y][x] = step; path.append(xy_to_idx(x,y,n))
-    return path
-
-# ... (O resto das funções de lógica backtracking e a classe GeneticKnightTour permanecem as mesmas)
-def backtracking_tour(n, start_idx=0, time_limit=5.0):
-    start_time = time.time(); sx,sy = idx_to_xy(start_idx,n); visited = [False]*(n*n); path = []
-    def dfs(x,y,step):
-        if time.time() - start_time > time_limit: return None
-        visited[xy_to_idx(x,y,n)] = True; path.append(xy_to_idx(x,y,n))
-        if step == n*n: return list(path)
-        nexts = []
-        for dx,dy in KNIGHT_MOVES:
-            nx,ny = x+dx,y+dy
-            if inbound(nx,ny,n) and not visited[xy_to_idx(nx,ny,n)]:
-                d=0
-                for dx2,dy2 in KNIGHT_MOVES:
-                    nnx,nny = nx+dx2, ny+dy2
-                    if inbound(nnx,nny,n) and not visited[xy_to_idx(nnx,nny,n)]: d+=1
-                nexts.append((d,nx,ny))
-        nexts.sort(key=lambda t:t[0])
-        for _,nx,ny in nexts:
-            res = dfs(nx,ny,step+1)
-            if res: return res
-        visited[xy_to_idx(x,y,n)] = False; path.pop()
-        return None
-    return dfs(sx,sy,1)
-
-class GeneticKnightTour:
-    def __init__(self, n, population_size, mutation_rate, tourn_size):
-        self.n = n
-        self.pop_size = population_size
-        self.mutation_rate = mutation_rate
-        self.tourn = tourn_size
-        self.population = []
-        self.fitnesses = []
-        self.generation = 0
-        self.best = None               # melhor cromossomo (perm)
-        self.best_fitness = -1         # tamanho do prefixo legal - 1 (número de arestas legais)
-        self.best_path = None          # caminho 100% legal correspondente a 'best'
-        self.best_fitness_history = []
-        self.avg_fitness_history = []
-
-    # ---------- Construção e reparo ----------
-    def init_population(self, start_idx=0):
-        self.generation = 0
-        self.best_fitness = -1
-        self.best_path = None
-        self.best_fitness_history = []
-        self.avg_fitness_history = []
-        self.population = []
-
-        # Em vez de permutações puras, inicialize com passeios de cavalo aleatórios e complete com casas faltantes
-        all_cells = set(range(self.n * self.n))
-        for _ in range(self.pop_size):
-            walk = random_knight_walk(self.n, start_idx=start_idx)
-            remaining = list(all_cells - set(walk))
-            random.shuffle(remaining)
-            chrom = walk + remaining
-            self.repair(chrom)  # já sai "legalizado"
-            self.population.append(chrom)
-
-        self.evaluate_all()
-
-    def _legal_prefix(self, chrom):
-        """Retorna o maior prefixo SEM repetir casas e só com movimentos válidos de cavalo.
-           Também retorna a versão 'ajustada' do cromossomo (com swaps locais)."""
-        n2 = self.n * self.n
-        visited = set([chrom[0]])
-        path = [chrom[0]]
-        chrom_adj = chrom[:]  # trabalhamos numa cópia
-
-        for i in range(1, n2):
-            prev = path[-1]
-            cur = chrom_adj[i]
-
-            # se já foi visitado ou o movimento não é legal, tentar achar gene mais à frente alcançável
-            if (cur in visited) or (not legal_knight_move(prev, cur, self.n)):
-                found = False
-                for j in range(i + 1, n2):
-                    cand = chrom_adj[j]
-                    if cand not in visited and legal_knight_move(prev, cand, self.n):
-                        # colocar candidato na posição i
-                        chrom_adj[i], chrom_adj[j] = chrom_adj[j], chrom_adj[i]
-                        cur = chrom_adj[i]
-                        found = True
-                        break
-                if not found:
-                    # não dá para seguir legalmente
-                    break
-
-            # agora cur é novo e alcançável
-            visited.add(cur)
-            path.append(cur)
-
-        return path, chrom_adj
-
-    def repair(self, chrom):
-        """Repara um cromossomo para maximizar o prefixo legal via swaps locais.
-           O cromossomo original é modificado in-place."""
-        path, fixed = self._legal_prefix(chrom)
-        chrom[:] = fixed  # sobrescreve com a versão reparada
-        return path
-
-    # ---------- Avaliação ----------
-    def fitness(self, chrom):
-        # 1) obtém prefixo legal (e o cromossomo ajustado)
-        base_path, _ = self._legal_prefix(chrom)
-        # 2) estende localmente com Warnsdorff aleatório (memético leve)
-        extended = randomized_warnsdorff_extend(self.n, base_path[:])
-        # fitness = arestas legais do caminho estendido
-        return max(0, len(extended) - 1), extended
- 
-    def evaluate_all(self):
-        fits = []
-        paths = []
-        for ch in self.population:
-            f, p = self.fitness(ch)
-            fits.append(f)
-            paths.append(p)
-
-        self.fitnesses = fits
-        current_gen_best = max(range(self.pop_size), key=lambda i: self.fitnesses[i])
-        current_best_fit = self.fitnesses[current_gen_best]
-
-        if current_best_fit > self.best_fitness:
-            self.best_fitness = current_best_fit
-            self.best = self.population[current_gen_best][:]
-            self.best_path = paths[current_gen_best][:]
-
-        self.best_fitness_history.append(self.best_fitness)
-        self.avg_fitness_history.append(sum(self.fitnesses) / self.pop_size)
-
-    # ---------- Seleção, Crossover, Mutação ----------
-    def tournament_select(self):
-        k = self.tourn
-        candidates = random.sample(range(self.pop_size), k)
-        best_idx = max(candidates, key=lambda i: self.fitnesses[i])
-        return deepcopy(self.population[best_idx])
-
-    def order_crossover(self, p1, p2):
-        n = len(p1)
-        a, b = sorted(random.sample(range(n), 2))
-        child = [-1] * n
-        child[a:b+1] = p1[a:b+1]
-        fill_pos = (b + 1) % n
-        for gene in p2[b+1:] + p2[:b+1]:
-            if gene not in child:
-                child[fill_pos] = gene
-                fill_pos = (fill_pos + 1) % n
-        return child
-
-    def mutate(self, chrom):
-        if random.random() < 0.5:
-            i, j = random.sample(range(1, len(chrom)), 2)
-            chrom[i], chrom[j] = chrom[j], chrom[i]
-        else:
-            a, b = sorted(random.sample(range(1, len(chrom)), 2))
-            chrom[a:b+1] = reversed(chrom[a:b+1])
-
-    # ---------- Loop ----------
-    def step(self):
-        newpop = [deepcopy(self.best)]  # elitismo (já está reparado)
-        while len(newpop) < self.pop_size:
-            p1 = self.tournament_select()
-            p2 = self.tournament_select()
-            child = self.edge_recombination_crossover(p1, p2)
-            if random.random() < self.mutation_rate:
-                self.mutate(child)
-            # Repara o filho antes de entrar na população
-            self.repair(child)
-            newpop.append(child)
-
-        self.population = newpop
-        self.evaluate_all()
-        self.generation += 1
-
-    
-        return self.best_fitness == (self.n * self.n) - 1
-    
-    def edge_recombination_crossover(self, p1, p2):
-        """ERX: constrói um filho preservando adjacências dos pais."""
-        n = len(p1)
-        # tabela de adjacências
-        adj = {g: set() for g in p1}
-        def add_edges(a, b):
-            for i in range(n):
-                left = a[(i - 1) % n]
-                right = a[(i + 1) % n]
-                adj[a[i]].update([left, right])
-            for i in range(n):
-                left = b[(i - 1) % n]
-                right = b[(i + 1) % n]
-                adj[b[i]].update([left, right])
-
-        add_edges(p1, p2)
-
-        child = []
-        used = set()
-        cur = p1[0]  # pode variar; simples: começa no primeiro de p1
-        for _ in range(n):
-            child.append(cur)
-            used.add(cur)
-            # remove 'cur' das listas adjacentes
-            for k in adj:
-                adj[k].discard(cur)
-            # escolhe próximo:
-            # 1) entre adjacentes de cur, pegue aquele cujo set adjacente é menor (mais restrito)
-            candidates = [x for x in adj[cur] if x not in used]
-            if candidates:
-                cur = min(candidates, key=lambda x: len(adj[x]))
+class DecimatedSeries:
+    """Série reduzida por min/max: os valores entram em baldes de 'width' gerações e cada balde
+       vira dois pontos (mínimo e máximo, na ordem em que ocorreram), então picos e quedas
+       continuam visíveis. Quando os baldes passam de budget/2, vizinhos são fundidos e a
+       largura dobra: cada valor custa O(1) amortizado e xy() nunca passa de 'budget' pontos."""
+    def __init__(self, budget=PLOT_POINTS):
+        self.budget = budget; self.width = 1; self.count = 0
+        self.buckets = []  # [x_min, y_min, x_max, y_max]
+
+    def extend(self, values):
+        for v in values:
+            x = self.count; self.count += 1
+            if x % self.width == 0:
+                self.buckets.append([x, v, x, v])
+                if len(self.buckets) > self.budget // 2: self._merge()
             else:
-                # 2) se não há adjacente disponível, escolha qualquer gene ainda não usado
-                remaining = [g for g in adj.keys() if g not in used]
-                if not remaining:
-                    break
-                cur = random.choice(remaining)
-        return child
+                b = self.buckets[-1]
+                if v < b[1]: b[0], b[1] = x, v
+                if v > b[3]: b[2], b[3] = x, v
+
+    def _merge(self):
+        merged = []
+        for a, b in zip(self.buckets[::2], self.buckets[1::2] + [None]):
+            if b is not None:
+                a = [*(a[:2] if a[1] <= b[1] else b[:2]), *(a[2:] if a[3] >= b[3] else b[2:])]
+            merged.append(a)
+        self.buckets = merged; self.width *= 2
+
+    def xy(self):
+        xs, ys = [], []
+        for x0, y0, x1, y1 in self.buckets:
+            if x0 == x1: xs.append(x0); ys.append(y0)
+            elif x0 < x1: xs += (x0, x1); ys += (y0, y1)
+            else: xs += (x1, x0); ys += (y1, y0)
+        return xs, ys
 
 # ----------------------------
 # Classe Principal da GUI
@@ -358,17 +103,22 @@ class KnightTourGUI:
             if hasattr(self, "graph_canvas"):
                 self.graph_canvas.draw()
 
-            # Salva com uma resolução boa e sem cortes
-            self.fig.savefig(filepath, dpi=150, bbox_inches="tight")
+            # Salva com uma resolução boa e sem cortes (curvas animadas não entram no savefig)
+            for line in (self._avg_line, self._best_line): line.set_animated(False)
+            try: self.fig.savefig(filepath, dpi=150, bbox_inches="tight")
+            finally:
+                for line in (self._avg_line, self._best_line): line.set_animated(True)
             messagebox.showinfo("Sucesso", f"Gráfico salvo em:\n{filepath}")
         except Exception as e:
             messagebox.showerror("Erro ao salvar", f"Não foi possível salvar o gráfico.\n\nDetalhes: {e}")
 
-    def __init__(self, root, n=BOARD_SIZE):
-        self.root = root; self.n = n; self.cell_size = 60; self.start_idx = 0; self.path = []
-        self.ga = None; self.ga_state = 'idle'; self.animation_state = 'idle'
+    def __init__(self, root, n=BOARD_SIZE, h=None):
+        self.root = root; self.n = n; self.h = n if h is None else h; self.cell_size = 60; self.start_idx = 0; self.path = []
+        self.ga = None; self.ga_state = 'idle'; self.animation_state = 'idle'; self.worker = None
         self.animation_step = 0; self.current_animation_path = None
         self.start_time = 0; self.elapsed_time_paused = 0; self.last_hover_idx = -1
+        try: self.cache = TourCache()
+        except (OSError, sqlite3.Error): self.cache = TourCache(None)  # sem disco gravável: cache só em memória
         self._setup_layout(); self._create_widgets(); self._bind_events(); self.redraw_canvas()
 
     def _setup_layout(self):
@@ -383,13 +133,17 @@ class KnightTourGUI:
         det_frame = ttk.LabelFrame(self.controls_frame, text="Algoritmos Determinísticos", padding=10); det_frame.pack(fill='x', expand=False, pady=5)
         self.warnsdorff_btn = ttk.Button(det_frame, text="Warnsdorff (Rápido)", command=self.run_warnsdorff); self.warnsdorff_btn.pack(fill='x', pady=2)
         self.backtracking_btn = ttk.Button(det_frame, text="Backtracking (Lento)", command=self.run_backtracking); self.backtracking_btn.pack(fill='x', pady=2)
+        self.divide_btn = ttk.Button(det_frame, text="Dividir e Conquistar (Grande)", command=self.run_divide_conquer); self.divide_btn.pack(fill='x', pady=2)
 
         ga_frame = ttk.LabelFrame(self.controls_frame, text="Algoritmo Genético", padding=10); ga_frame.pack(fill='x', expand=False, pady=5)
         ttk.Label(ga_frame, text="População:").pack(anchor='w'); self.pop_spin = tk.Spinbox(ga_frame, from_=50, to=2000, increment=50, width=10); self.pop_spin.delete(0,"end"); self.pop_spin.insert(0,str(GA_POP)); self.pop_spin.pack(fill='x', pady=2)
         ttk.Label(ga_frame, text="Taxa de Mutação:").pack(anchor='w'); self.mut_spin = tk.Spinbox(ga_frame, from_=0.0, to=1.0, increment=0.01, width=10, format="%.2f"); self.mut_spin.delete(0,"end"); self.mut_spin.insert(0,str(GA_MUT_RATE)); self.mut_spin.pack(fill='x', pady=2)
+        self.adaptive_var = tk.BooleanVar(value=False); self.adaptive_chk = ttk.Checkbutton(ga_frame, text="Controle adaptativo", variable=self.adaptive_var); self.adaptive_chk.pack(anchor='w', pady=2)
+        self.profile_var = tk.BooleanVar(value=False); self.profile_chk = ttk.Checkbutton(ga_frame, text="Medir fases (perfil)", variable=self.profile_var); self.profile_chk.pack(anchor='w', pady=2)
 
         run_frame = ttk.LabelFrame(self.controls_frame, text="Controle de Execução", padding=10); run_frame.pack(fill='x', expand=False, pady=5)
         self.run_ga_btn = ttk.Button(run_frame, text="Iniciar GA", command=self.toggle_ga_run); self.run_ga_btn.pack(fill='x', pady=2)
+        self.cancel_btn = ttk.Button(run_frame, text="Cancelar Execução", command=self.cancel_run, state=tk.DISABLED); self.cancel_btn.pack(fill='x', pady=2)
         self.pause_anim_btn = ttk.Button(run_frame, text="Pausar Animação", command=self.toggle_animation_pause, state=tk.DISABLED); self.pause_anim_btn.pack(fill='x', pady=2)
         self.reset_btn = ttk.Button(run_frame, text="Resetar Tabuleiro", command=self.reset); self.reset_btn.pack(fill='x', pady=2)
 
@@ -412,6 +166,7 @@ class KnightTourGUI:
         self.status_bar = ttk.Frame(self.root, padding=5); self.status_bar.grid(row=1, column=0, columnspan=2, sticky='ew')
         self.gen_label = ttk.Label(self.status_bar, text="Geração: -"); self.gen_label.pack(side='left', padx=10)
         self.fit_label = ttk.Label(self.status_bar, text="Aptidão: -"); self.fit_label.pack(side='left', padx=10)
+        self.perf_label = ttk.Label(self.status_bar, text=""); self.perf_label.pack(side='left', padx=10)
         self.time_label = ttk.Label(self.status_bar, text="Tempo: 0.0s"); self.time_label.pack(side='left', padx=10)
         self.status_label = ttk.Label(self.status_bar, text="Status: Pronto."); self.status_label.pack(side='right', padx=10)
 
@@ -420,61 +175,105 @@ class KnightTourGUI:
         self.canvas.bind("<Motion>", self._on_mouse_hover); self.canvas.bind("<Leave>", lambda e: self.canvas.delete("warnsdorff_viz"))
         self.root.bind("<Escape>", lambda e: self.root.attributes("-fullscreen", False))
 
-    def _on_resize(self, event): self.cell_size = max(20, min(event.width, event.height) // self.n); self.redraw_canvas()
+    def _on_resize(self, event): self.cell_size = max(20, min(event.width // self.n, event.height // self.h)); self.redraw_canvas()
 
     def _on_click(self, event):
-        if self.ga_state != 'idle' or self.animation_state != 'idle': return
+        if self.worker or self.ga_state != 'idle' or self.animation_state != 'idle': return
         c = int(event.x // self.cell_size); r = int(event.y // self.cell_size)
-        if inbound(c, r, self.n): self.start_idx = xy_to_idx(c, r, self.n); self.reset(); self.status_label.config(text=f"Ponto inicial: {self.start_idx} ({c},{r})")
+        if inbound(c, r, self.n, self.h): self.start_idx = xy_to_idx(c, r, self.n); self.reset(); self.status_label.config(text=f"Ponto inicial: {self.start_idx} ({c},{r})")
 
     def _on_mouse_hover(self, event):
-        if self.ga_state != 'idle' or self.animation_state != 'idle': return
+        if self.worker or self.ga_state != 'idle' or self.animation_state != 'idle': return
         c, r = int(event.x // self.cell_size), int(event.y // self.cell_size)
+        if not inbound(c, r, self.n, self.h): return
         idx = xy_to_idx(c, r, self.n)
         if idx == self.last_hover_idx: return
         self.last_hover_idx = idx
         self.canvas.delete("warnsdorff_viz")
-        
-        def get_degree(from_idx):
-            d = 0; x, y = idx_to_xy(from_idx, self.n)
-            for dx, dy in KNIGHT_MOVES:
-                if inbound(x+dx, y+dy, self.n): d += 1
-            return d
-            
-        x,y = idx_to_xy(idx, self.n)
-        for dx, dy in KNIGHT_MOVES:
-            nx, ny = x+dx, y+dy
-            if inbound(nx, ny, self.n):
-                next_idx = xy_to_idx(nx,ny,self.n)
-                degree = get_degree(next_idx)
-                cx, cy = nx*self.cell_size+self.cell_size/2, ny*self.cell_size+self.cell_size/2
-                self.canvas.create_text(cx, cy, text=str(degree), fill="white", font=('Arial', int(self.cell_size/4), 'bold'), tags="warnsdorff_viz")
+        topo = get_topology(self.n, self.h)
+        for next_idx in topo.neighbors[idx]:
+            nx, ny = idx_to_xy(next_idx, self.n)
+            degree = topo.degree[next_idx]
+            cx, cy = nx*self.cell_size+self.cell_size/2, ny*self.cell_size+self.cell_size/2
+            self.canvas.create_text(cx, cy, text=str(degree), fill="white", font=('Arial', int(self.cell_size/4), 'bold'), tags="warnsdorff_viz")
+
+    # --- Renderização retida: os itens do canvas são criados uma vez e depois só movidos/recoloridos ---
+    def _center(self, idx): cs = self.cell_size; return idx % self.n * cs + cs/2, idx // self.n * cs + cs/2
+
+    def _build_board(self):
+        """Cria as casas, os itens do caminho (ocultos) e o marcador de início. Só roda quando n x h muda."""
+        self.canvas.delete("all"); n, h = self.n, self.h
+        self._squares = [self.canvas.create_rectangle(0,0,0,0, fill="#f0d9b5" if (r+c)%2==0 else "#b58863", outline='black') for r in range(h) for c in range(n)]
+        # Todas as linhas antes de todos os círculos: a ordem de criação fixa o empilhamento
+        self._segs = [self.canvas.create_line(0,0,0,0, width=3, state='hidden', tags="path") for _ in range(n*h-1)]
+        self._ovals = [self.canvas.create_oval(0,0,0,0, fill='lightblue', outline='darkblue', state='hidden', tags="path") for _ in range(n*h)]
+        self._labels = [self.canvas.create_text(0,0, text=str(i+1), state='hidden', tags="path") for i in range(n*h)]
+        self._knight = self.canvas.create_text(0,0, text="♞", fill='black', state='hidden', tags="path")
+        self._start_marker = self.canvas.create_text(0,0, text="S", fill='green', state='hidden')
+        self._board_n = (n, h); self._laid_out_size = None
+        self._gradients = {}; r1,g1,b1 = self.root.winfo_rgb("#FFFF00"); r2,g2,b2 = self.root.winfo_rgb("#FF4500"); self._grad_ends = (r1,g1,b1,r2,g2,b2)
+        self._forget_path()
+
+    def _forget_path(self):
+        """Esquece o que está desenhado: a próxima atualização reposiciona e recolore tudo."""
+        self._seg_keys = [None]*len(self._segs); self._node_keys = [None]*len(self._ovals)
+        self._shown_segs = self._shown_nodes = 0; self._drawn = (None, 0, False)
+        self.canvas.itemconfig("path", state='hidden')
+
+    def _layout_board(self):
+        """Redimensiona as casas com coords (sem recriar itens) e atualiza as fontes."""
+        cs = self.cell_size
+        for i, item in enumerate(self._squares): x0, y0 = i % self.n * cs, i // self.n * cs; self.canvas.coords(item, x0, y0, x0+cs, y0+cs)
+        font = ('Arial', int(cs/5), 'bold')
+        for item in self._labels: self.canvas.itemconfig(item, font=font)
+        self.canvas.itemconfig(self._knight, font=('Arial', int(cs/1.5))); self.canvas.itemconfig(self._start_marker, font=('Arial', int(cs/3), 'bold'))
+        self._laid_out_size = cs; self._forget_path()
+
+    def _gradient(self, length):
+        """Cores amarelo -> laranja-avermelhado de um caminho com 'length' casas (calculadas uma vez por tamanho)."""
+        if length not in self._gradients:
+            r1,g1,b1,r2,g2,b2 = self._grad_ends; span = max(1, length-1)
+            self._gradients[length] = [f'#{int(r1+(r2-r1)*f)//256:02x}{int(g1+(g2-g1)*f)//256:02x}{int(b1+(b2-b1)*f)//256:02x}' for f in (i/span for i in range(length))]
+        return self._gradients[length]
 
     def redraw_canvas(self):
-        self.canvas.delete("all")
-        for r in range(self.n):
-            for c in range(self.n):
-                x0,y0 = c*self.cell_size, r*self.cell_size; color = "#f0d9b5" if (r+c)%2==0 else "#b58863"
-                self.canvas.create_rectangle(x0,y0,x0+self.cell_size,y0+self.cell_size, fill=color, outline='black')
-        if self.path: self._draw_path_snapshot(self.path, len(self.path)-1, is_final=True, is_solution=len(self.path)==self.n*self.n)
-        if self.ga_state == 'idle' and self.animation_state == 'idle':
-             x,y=idx_to_xy(self.start_idx, self.n); cx,cy=x*self.cell_size+self.cell_size/2, y*self.cell_size+self.cell_size/2
-             self.canvas.create_text(cx,cy, text="S", font=('Arial', int(self.cell_size/3), 'bold'), fill='green')
+        if getattr(self, '_board_n', None) != (self.n, self.h): self._build_board()
+        if self._laid_out_size != self.cell_size: self._layout_board()
+        if self.path: self._draw_path_snapshot(self.path, len(self.path)-1, is_final=True, is_solution=len(self.path)==self.n*self.h)
+        elif self._drawn[0] is not None: self._forget_path()
+        if self.worker is None and self.ga_state == 'idle' and self.animation_state == 'idle':
+            self.canvas.coords(self._start_marker, *self._center(self.start_idx)); self.canvas.itemconfig(self._start_marker, state='normal')
+        else: self.canvas.itemconfig(self._start_marker, state='hidden')
 
     def _draw_path_snapshot(self, path, current_step, is_final=False, is_solution=False):
-        self.canvas.delete("path");
-        if not path: return
-        def interpolate_color(start, end, frac): r1,g1,b1=self.root.winfo_rgb(start); r2,g2,b2=self.root.winfo_rgb(end); r,g,b = r1+(r2-r1)*frac, g1+(g2-g1)*frac, b1+(b2-b1)*frac; return f'#{int(r)//256:02x}{int(g)//256:02x}{int(b)//256:02x}'
-        for i in range(min(current_step, len(path)-1)):
-            x1,y1=idx_to_xy(path[i],self.n); x2,y2=idx_to_xy(path[i+1],self.n); cx1,cy1=x1*self.cell_size+self.cell_size/2, y1*self.cell_size+self.cell_size/2; cx2,cy2=x2*self.cell_size+self.cell_size/2, y2*self.cell_size+self.cell_size/2
-            color = "gold" if is_solution else interpolate_color("#FFFF00", "#FF4500", i / max(1, len(path)-1)); self.canvas.create_line(cx1,cy1,cx2,cy2, width=3, fill=color, tags="path")
-        for i, idx in enumerate(path[:current_step+1]):
-            x,y=idx_to_xy(idx, self.n); cx,cy=x*self.cell_size+self.cell_size/2, y*self.cell_size+self.cell_size/2
-            if i == current_step and not is_final: self.canvas.create_text(cx,cy, text="♞", font=('Arial', int(self.cell_size/1.5)), fill='black', tags="path")
-            else: r=self.cell_size/4; self.canvas.create_oval(cx-r,cy-r,cx+r,cy+r, fill='lightblue', outline='darkblue', tags="path"); self.canvas.create_text(cx,cy, text=str(i+1), font=('Arial',int(self.cell_size/5),'bold'), tags="path")
+        """Atualiza só o que mudou: num quadro de animação (mesmo caminho, um passo a mais) são O(1)
+           chamadas ao canvas; numa geração do GA, só os segmentos/casas diferentes do quadro anterior."""
+        if not path: self._forget_path(); return
+        cv = self.canvas; L = len(path); r = self.cell_size/4; center = self._center
+        colors = None if is_solution else self._gradient(L)
+        n_segs = min(current_step, L-1); n_nodes = min(current_step+1, L) - (0 if is_final else 1)
+        same = self._drawn[0] is path and self._drawn[1:] == (L, is_solution)
+        for i in (range(self._shown_segs, n_segs) if same else range(n_segs)):
+            key = (path[i], path[i+1], "gold" if is_solution else colors[i])
+            if self._seg_keys[i] != key:
+                cv.coords(self._segs[i], *center(key[0]), *center(key[1])); cv.itemconfig(self._segs[i], fill=key[2], state='normal'); self._seg_keys[i] = key
+            elif i >= self._shown_segs: cv.itemconfig(self._segs[i], state='normal')
+        for i in range(n_segs, self._shown_segs): cv.itemconfig(self._segs[i], state='hidden')
+        for i in (range(self._shown_nodes, n_nodes) if same else range(n_nodes)):
+            if self._node_keys[i] != path[i]:
+                cx, cy = center(path[i]); cv.coords(self._ovals[i], cx-r, cy-r, cx+r, cy+r); cv.coords(self._labels[i], cx, cy); self._node_keys[i] = path[i]
+                cv.itemconfig(self._ovals[i], fill='lightblue', state='normal'); cv.itemconfig(self._labels[i], fill='black', state='normal')
+            elif i >= self._shown_nodes: cv.itemconfig(self._ovals[i], state='normal'); cv.itemconfig(self._labels[i], state='normal')
+        for i in range(n_nodes, self._shown_nodes): cv.itemconfig(self._ovals[i], state='hidden'); cv.itemconfig(self._labels[i], state='hidden')
+        if not is_final and current_step < L: cv.coords(self._knight, *center(path[current_step])); cv.itemconfig(self._knight, fill='black', state='normal')
+        else: cv.itemconfig(self._knight, state='hidden')
+        self._shown_segs, self._shown_nodes, self._drawn = n_segs, n_nodes, (path, L, is_solution)
 
     def animate_path(self, path, is_solution=False):
         if not path or self.animation_state != 'idle': return
+        # Confere o caminho antes de animar: solução = passeio completo; senão, prefixo legal
+        violation = tour_violation(path, self.n, self.h, complete=is_solution)
+        if violation: self._update_status(message=f"Caminho inválido: {violation['message']}", color="red"); return
         self.current_animation_path=path; self.animation_step=0; self.animation_state='running'
         self._toggle_controls(tk.DISABLED); self.pause_anim_btn.config(state=tk.NORMAL, text="Pausar Animação")
         self.animation_loop(is_solution)
@@ -493,17 +292,17 @@ class KnightTourGUI:
 
     def toggle_animation_pause(self):
         if self.animation_state == 'running': self.animation_state='paused'; self.pause_anim_btn.config(text="Continuar Animação"); self._update_status(message=f"Animação pausada no passo {self.animation_step}.")
-        elif self.animation_state == 'paused': self.animation_state='running'; self.pause_anim_btn.config(text="Pausar Animação"); self.animation_loop(len(self.current_animation_path)==self.n*self.n)
+        elif self.animation_state == 'paused': self.animation_state='running'; self.pause_anim_btn.config(text="Pausar Animação"); self.animation_loop(len(self.current_animation_path)==self.n*self.h)
 
     def flash_solution(self):
         def flash(count):
-            if count <= 0 or self.animation_state != 'idle': self.redraw_canvas(); return
+            if count <= 0 or self.animation_state != 'idle': self._forget_path(); self.redraw_canvas(); return
             color = "gold" if count % 2 != 0 else "#f0d9b5"
             self.canvas.itemconfig("path", fill=color); self.root.after(300, flash, count-1)
         flash(5)
 
     def _toggle_controls(self, state):
-        for w in [self.warnsdorff_btn, self.backtracking_btn, self.reset_btn, self.pop_spin, self.mut_spin]: w.config(state=state)
+        for w in [self.warnsdorff_btn, self.backtracking_btn, self.divide_btn, self.reset_btn, self.pop_spin, self.mut_spin, self.adaptive_chk, self.profile_chk]: w.config(state=state)
         self.run_ga_btn.config(state=tk.DISABLED if state==tk.DISABLED else tk.NORMAL)
         if self.animation_state != 'idle': self.run_ga_btn.config(state=tk.DISABLED)
 
@@ -515,55 +314,134 @@ class KnightTourGUI:
         if color: self.status_bar.config(style=f"{color.capitalize()}.TFrame")
         else: self.status_bar.config(style="TFrame")
 
-    def run_warnsdorff(self):
-        self._update_status(message="Executando Warnsdorff...", color="yellow"); self.root.update_idletasks()
-        self.path = warnsdorff_tour(self.n, self.start_idx); is_solution = len(self.path)==self.n*self.n
-        msg = "Solução encontrada!" if is_solution else f"Caminho parcial com {len(self.path)} passos."; self._update_status(message=f"Warnsdorff: {msg}", color=None); self.animate_path(self.path, is_solution)
-
-    def run_backtracking(self):
-        self._update_status(message="Executando Backtracking...", color="yellow"); self.root.update_idletasks()
-        self.path = backtracking_tour(self.n, self.start_idx)
-        if self.path: self._update_status(message="Backtracking: Solução encontrada!", color=None); self.animate_path(self.path, True)
-        else: self._update_status(message="Backtracking não encontrou solução no tempo limite.", color=None)
+    # --- Execução em segundo plano: os solvers rodam num SolverWorker e a interface só lê a fila ---
+    def _start_worker(self, job, on_done, on_snapshot=None):
+        self.worker = SolverWorker(job).start(); self._worker_done = on_done; self._worker_snapshot = on_snapshot
+        self._toggle_controls(tk.DISABLED); self.cancel_btn.config(state=tk.NORMAL)
+        self.root.after(FRAME_INTERVAL, self._poll_worker)
+
+    def _poll_worker(self):
+        """Um quadro: junta tudo o que o worker publicou desde o último quadro e desenha só o estado mais recente."""
+        if self.worker is None: return
+        snap = self.worker.latest()
+        if snap and self._worker_snapshot and 'path' in snap: self._worker_snapshot(snap)
+        if snap and snap.get('done'):
+            self.worker = None; self.cancel_btn.config(state=tk.DISABLED); self._toggle_controls(tk.NORMAL); self._worker_done(snap)
+            return
+        self.root.after(FRAME_INTERVAL, self._poll_worker)
+
+    def cancel_run(self):
+        if self.worker: self.worker.cancel(); self._update_status(message="Cancelando...", color="yellow")
+
+    def _tour_job(self, solver, cancellable=False):
+        """Job de um solver determinístico: consulta o cache antes e guarda passeios completos depois."""
+        n, h, start, cache = self.n, self.h, self.start_idx, self.cache
+        def job(checkpoint):
+            path = cache.get(n, h, start)
+            if path is not None: yield {'path': path, 'cached': True}; return
+            kwargs = {'should_stop': checkpoint} if cancellable else {}
+            path = solver(n, start, height=h, **kwargs) or []
+            if len(path) == n*h: cache.put(n, h, path)
+            yield {'path': path, 'cached': False}
+        return job
+
+    def _run_tour(self, name, solver, fail_msg, cancellable=False):
+        self._update_status(message=f"Executando {name}...", color="yellow")
+        self._start_worker(self._tour_job(solver, cancellable), lambda snap: self._tour_done(name, fail_msg, snap))
+
+    def _tour_done(self, name, fail_msg, snap):
+        if snap.get('error'): self._update_status(message=f"{name}: erro ({snap['error']}).", color=None); return
+        if snap.get('cancelled'): self._update_status(message=f"{name}: cancelado.", color=None); return
+        self.path = snap['path']; is_solution = len(self.path)==self.n*self.h
+        if is_solution: msg = f"{name}: Solução {'do cache' if snap['cached'] else 'encontrada'}!"
+        elif self.path: msg = f"{name}: Caminho parcial com {len(self.path)} passos."
+        else: msg = fail_msg
+        self._update_status(message=msg, color=None); self.animate_path(self.path, is_solution)
+
+    def run_warnsdorff(self): self._run_tour("Warnsdorff", warnsdorff_tour, "Warnsdorff: nenhum caminho.")
+
+    def run_backtracking(self): self._run_tour("Backtracking", backtracking_tour, "Backtracking não encontrou solução no tempo limite.", cancellable=True)
+
+    def run_divide_conquer(self): self._run_tour("Dividir e Conquistar", divide_conquer_tour, "Dividir e Conquistar: sem passeio a partir desta casa.")
 
     def reset(self):
-        if self.ga_state != 'idle' or self.animation_state != 'idle': return
+        if self.worker or self.ga_state != 'idle' or self.animation_state != 'idle': return
+        if self.ga: self.ga.close()
         self.path=[]; self.ga=None; self.elapsed_time_paused=0; self.animation_state='idle'; self.last_hover_idx=-1
-        self.pause_anim_btn.config(state=tk.DISABLED); self._update_status(gen='-', fitness='-', total='-', elapsed=0.0, message="Pronto.", color=None)
+        self.pause_anim_btn.config(state=tk.DISABLED); self.perf_label.config(text=""); self._update_status(gen='-', fitness='-', total='-', elapsed=0.0, message="Pronto.", color=None)
         if MATPLOTLIB_AVAILABLE: self.init_ga_graph(); self.redraw_canvas()
 
     def toggle_ga_run(self):
         if self.ga_state == 'idle':
-            pop=int(self.pop_spin.get()); mut=float(self.mut_spin.get()); self.ga=GeneticKnightTour(self.n,pop,mut,GA_TOURN); self.ga.init_population(self.start_idx)
-            self.ga_state='running'; self.run_ga_btn.config(text="Pausar GA"); self._toggle_controls(tk.DISABLED); self.start_time=time.time(); self.ga_loop()
-        elif self.ga_state == 'running': self.ga_state='paused'; self.elapsed_time_paused=time.time()-self.start_time; self.run_ga_btn.config(text="Continuar GA"); self._update_status(color="yellow", message="GA Pausado.")
-        elif self.ga_state == 'paused': self.ga_state='running'; self.run_ga_btn.config(text="Pausar GA"); self.start_time=time.time()-self.elapsed_time_paused; self.ga_loop()
-
-    def ga_loop(self):
-        if self.ga_state != 'running':
-            if self.ga_state == 'idle': self._toggle_controls(tk.NORMAL); self.run_ga_btn.config(text="Iniciar GA")
-            return
-        solution_found = self.ga.step()
-        self.path = self.ga.best_path[:] if self.ga.best_path else []
-        self.redraw_canvas()
-        max_fitness = self.n*self.n-1; elapsed = time.time()-self.start_time
-        self._update_status(gen=self.ga.generation, fitness=self.ga.best_fitness, total=max_fitness, elapsed=elapsed, message="GA em execução...", color="yellow")
-        if MATPLOTLIB_AVAILABLE and (self.ga.generation % 5 == 0 or solution_found): self.update_ga_graph()
-        if solution_found or self.ga.generation >= GA_GEN_LIMIT:
-            self.ga_state = 'idle'; msg = "SOLUÇÃO PERFEITA encontrada!" if solution_found else "Limite de gerações atingido."
-            self._update_status(message=msg, color=None); self.animate_path(self.path, is_solution=solution_found)
-        if self.ga_state == 'running': self.root.after(1, self.ga_loop)
-
+            pop=int(self.pop_spin.get()); mut=float(self.mut_spin.get()); self.ga=GeneticKnightTour(self.n,pop,mut,GA_TOURN,workers=GA_WORKERS,height=self.h)
+            if self.profile_var.get(): self.ga.profiler = GAProfiler()
+            if self.adaptive_var.get(): self.ga.controller = AdaptiveController(self.ga)
+            if MATPLOTLIB_AVAILABLE: self.init_ga_graph()   # séries novas: as da execução anterior não valem para este ga
+            self.ga_state='running'; self._plotted_gen=-1; self.start_time=time.time(); self._update_status(message="Criando população...", color="yellow")
+            self._start_worker(self._ga_job(), self._ga_done, self._ga_snapshot); self.run_ga_btn.config(text="Pausar GA", state=tk.NORMAL)
+        elif self.ga_state == 'running': self.worker.pause(); self.ga_state='paused'; self.elapsed_time_paused=time.time()-self.start_time; self.run_ga_btn.config(text="Continuar GA"); self._update_status(color="yellow", message="GA Pausado.")
+        elif self.ga_state == 'paused': self.worker.resume(); self.ga_state='running'; self.run_ga_btn.config(text="Pausar GA"); self.start_time=time.time()-self.elapsed_time_paused
+
+    def _ga_job(self):
+        """Job do GA: uma geração por snapshot; o worker pausa/cancela entre gerações."""
+        ga, start = self.ga, self.start_idx
+        def job(checkpoint):
+            ga.init_population(start)
+            while True:
+                solved = ga.step()
+                stop = ga.controller is not None and not solved and ga.controller.update(GA_GEN_LIMIT)
+                yield {'path': ga.best_path[:] if ga.best_path else [], 'generation': ga.generation,
+                       'fitness': ga.best_fitness, 'solved': solved, 'stopped': stop,
+                       'profile': ga.profiler.readout() if ga.profiler else ""}
+                if solved or stop or ga.generation >= GA_GEN_LIMIT: return
+        return job
+
+    def _ga_snapshot(self, snap):
+        self.path = snap['path']; self.redraw_canvas()
+        elapsed = self.elapsed_time_paused if self.ga_state == 'paused' else time.time()-self.start_time
+        self._update_status(gen=snap['generation'], fitness=snap['fitness'], total=self.n*self.h-1, elapsed=elapsed,
+                            message="GA Pausado." if self.ga_state == 'paused' else "GA em execução...", color="yellow")
+        self.perf_label.config(text=snap['profile'])
+        if MATPLOTLIB_AVAILABLE and snap['generation'] != self._plotted_gen:
+            self._plotted_gen = snap['generation']; self.update_ga_graph()
+
+    def _ga_done(self, snap):
+        self.ga_state = 'idle'; self.ga.close(); self.run_ga_btn.config(text="Iniciar GA")
+        if snap.get('error'): self._update_status(message=f"GA: erro ({snap['error']}).", color=None); return
+        if snap.get('cancelled'): self._update_status(message="GA cancelado.", color=None); return
+        solution_found = snap['solved']
+        if solution_found: self.cache.put(self.n, self.h, self.path)
+        msg = "SOLUÇÃO PERFEITA encontrada!" if solution_found else "GA estagnou: parada antecipada." if snap['stopped'] else "Limite de gerações atingido."
+        self._update_status(message=msg, color=None); self.animate_path(self.path, is_solution=solution_found)
+
+    # --- Gráfico do GA: artistas persistentes atualizados com set_data e blitting ---
     def init_ga_graph(self):
-        self.ax_graph.clear(); self.ax_graph.set_title("Convergência do GA"); self.ax_graph.set_xlabel("Geração"); self.ax_graph.set_ylabel("Aptidão")
-        self.ax_graph.grid(True, linestyle='--', alpha=0.6); self.fig.tight_layout(); self.graph_canvas.draw()
+        ax = self.ax_graph; ax.clear(); ax.set_title("Convergência do GA"); ax.set_xlabel("Geração"); ax.set_ylabel("Aptidão")
+        ax.grid(True, linestyle='--', alpha=0.6); ax.set_xlim(0, 50); ax.set_ylim(0, self.n*self.h)
+        self._avg_line, = ax.plot([], [], label='Aptidão Média', color='deepskyblue', animated=True)
+        self._best_line, = ax.plot([], [], label='Melhor Aptidão', color='darkorange', linewidth=2, animated=True)
+        ax.legend(loc='lower right'); self._avg_series = DecimatedSeries(); self._best_series = DecimatedSeries(); self._graph_bg = None
+        if not getattr(self, '_graph_draw_cid', None): self._graph_draw_cid = self.graph_canvas.mpl_connect('draw_event', self._on_graph_draw)
+        self.fig.tight_layout(); self.graph_canvas.draw()
+
+    def _on_graph_draw(self, event):
+        """Depois de um desenho completo (início, zoom de eixo, redimensionamento) guarda o fundo para o blit."""
+        self._graph_bg = self.graph_canvas.copy_from_bbox(self.ax_graph.bbox)
+        self.ax_graph.draw_artist(self._avg_line); self.ax_graph.draw_artist(self._best_line)
 
     def update_ga_graph(self):
-        self.ax_graph.clear(); self.ax_graph.grid(True, linestyle='--', alpha=0.6)
-        self.ax_graph.plot(self.ga.avg_fitness_history, label='Aptidão Média', color='deepskyblue')
-        self.ax_graph.plot(self.ga.best_fitness_history, label='Melhor Aptidão', color='darkorange', linewidth=2)
-        self.ax_graph.legend(); self.ax_graph.set_title("Convergência do GA"); self.ax_graph.set_xlabel("Geração"); self.ax_graph.set_ylabel("Aptidão")
-        self.fig.tight_layout(); self.graph_canvas.draw()
+        """Custo constante: só as gerações novas entram nas séries decimadas e só as duas curvas são redesenhadas.
+           O eixo x dobra quando a curva chega ao fim, o que força um desenho completo apenas O(log gerações) vezes."""
+        self._avg_series.extend(self.ga.avg_fitness_history[self._avg_series.count:])
+        self._best_series.extend(self.ga.best_fitness_history[self._best_series.count:])
+        self._avg_line.set_data(*self._avg_series.xy()); self._best_line.set_data(*self._best_series.xy())
+        last = max(self._avg_series.count, self._best_series.count)
+        if last > self.ax_graph.get_xlim()[1] or self._graph_bg is None:
+            self.ax_graph.set_xlim(0, max(50, 2*last)); self.graph_canvas.draw()  # draw_event recaptura o fundo
+            return
+        self.graph_canvas.restore_region(self._graph_bg)
+        self.ax_graph.draw_artist(self._avg_line); self.ax_graph.draw_artist(self._best_line)
+        self.graph_canvas.blit(self.ax_graph.bbox)
 
 
 # ----------------------------
@@ -588,8 +466,9 @@ if __name__ == "__main__":
     style = ttk.Style()
     style.configure("Green.TFrame", background="darkgreen")
     style.configure("Yellow.TFrame", background="#8B8000") # Dark Yellow
+    style.configure("Red.TFrame", background="darkred")
 
     root.state('zoomed')
-    app = KnightTourGUI(root, n=BOARD_SIZE)
+    app = KnightTourGUI(root, n=BOARD_SIZE, h=BOARD_HEIGHT)
 
     root.mainloop()
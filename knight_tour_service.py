@@ -0,0 +1,508 @@
+"""
+knight_tour_service.py
+Serviço local de resolução em lote: um servidor HTTP em localhost recebe lotes de jobs
+(tamanho do tabuleiro, casa inicial, solver, orçamento), enfileira por prioridade,
+distribui num pool de processos que chama knight_tour.solve, junta pedidos idênticos
+que ainda estão em andamento e devolve os resultados em streaming (JSON Lines), na
+ordem em que terminam.
+
+Exemplos:
+    python knight_tour_service.py serve --port 8765 --workers 4 --cache
+    python knight_tour_service.py submit --solver backtracking --sizes 5-8 --starts canonical --time-limit 5
+    python knight_tour_service.py submit --solver ga --sizes 8 --starts 0,27 --priority 10 --no-path
+    python knight_tour_service.py status
+
+Protocolo:
+    POST /jobs           {"jobs": [{...}, ...]}  -> linha {"accepted": [ids]} e depois um resultado por linha
+                         (Content-Type: application/json; 'options' só com as chaves de JOB_OPTIONS)
+    POST /jobs?wait=0    só enfileira e devolve {"accepted": [ids]}
+    GET  /jobs/<id>      estado (e resultado, se pronto) de um job
+    GET  /status         tamanho da fila, jobs em execução, concluídos
+"""
+import argparse
+import heapq
+import http.client
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from knight_tour import (BOARD_SIZE, CACHED_SOLVERS, GA_BACKENDS, GA_GEN_LIMIT, ISLAND_TOPOLOGIES, SOLVERS,
+                         canonical_starts, solve)
+from knight_tour_cache import TOUR_CACHE_PATH, TourCache
+from knight_tour_validate import tour_violation
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+DEFAULT_TIME_LIMIT = 10.0          # orçamento de um job que não informa time_limit (s)
+MAX_TIME_LIMIT = 120.0             # teto do servidor: time_limit maiores são reduzidos a este valor (s)
+JOB_GRACE = 5.0                    # folga além do orçamento antes de matar o processo do job (s)
+JOB_FIELDS = ('solver', 'n', 'height', 'start_idx', 'seed', 'time_limit', 'generations', 'closed', 'options')
+# Opções que um cliente pode repassar a solve(), por solver, com o conversor de cada uma.
+# Nada que grave arquivos (profile, checkpoint, resume) ou escolha processos (workers) entra aqui.
+_GA_OPTIONS = {'population_size': int, 'mutation_rate': float, 'tourn_size': int,
+               'backend': lambda v: _choice(v, sorted(GA_BACKENDS))}
+JOB_OPTIONS = {
+    'ga': {**_GA_OPTIONS, 'adaptive': lambda v: _adaptive_option(v)},
+    'islands': {**_GA_OPTIONS, 'islands': int, 'migration_interval': int, 'migrants': int,
+                'topology': lambda v: _choice(v, ISLAND_TOPOLOGIES)},
+}
+ADAPTIVE_OPTIONS = {'window': int, 'mutation_boost': float, 'max_mutation': float, 'max_tourn': int,
+                    'escalations': int, 'restart_fraction': float, 'max_restarts': int, 'min_expected_gain': float}
+
+# ----------------------------
+# Jobs
+# ----------------------------
+def _choice(value, options):
+    if value not in options:
+        raise ValueError(f"{value!r} não é uma das opções {', '.join(options)}")
+    return value
+
+def _adaptive_option(value):
+    """'adaptive' do GA: booleano ou dict só com parâmetros numéricos do AdaptiveController."""
+    if isinstance(value, bool): return value
+    if not isinstance(value, dict): raise ValueError("'adaptive' deve ser booleano ou objeto")
+    return _checked_options(value, ADAPTIVE_OPTIONS, "adaptive")
+
+def _checked_options(options, allowed, owner):
+    unknown = sorted(set(options) - set(allowed))
+    if unknown:
+        raise ValueError(f"Opções não permitidas para {owner}: {', '.join(map(str, unknown))}")
+    return {k: allowed[k](v) for k, v in options.items()}
+
+def normalize_job(job):
+    """Valida um job vindo do cliente e preenche os padrões ('height' padrão = 'n').
+       Levanta ValueError se inválido."""
+    if not isinstance(job, dict):
+        raise ValueError(f"job deve ser um objeto (recebido {job!r})")
+    n = int(job.get('n', BOARD_SIZE))
+    spec = {'solver': job.get('solver', 'warnsdorff'), 'n': n, 'height': int(job.get('height') or n),
+            'start_idx': int(job.get('start_idx', 0)), 'seed': job.get('seed'),
+            'time_limit': float(DEFAULT_TIME_LIMIT if job.get('time_limit') is None else job['time_limit']),
+            'generations': int(job.get('generations', GA_GEN_LIMIT)), 'closed': bool(job.get('closed', False)),
+            'options': job.get('options') or {}}
+    if spec['solver'] not in SOLVERS:
+        raise ValueError(f"Solver desconhecido: {spec['solver']!r} (opções: {', '.join(SOLVERS)})")
+    if not (math.isfinite(spec['time_limit']) and spec['time_limit'] > 0):
+        raise ValueError(f"'time_limit' deve ser um número positivo (recebido {job['time_limit']!r})")
+    if not isinstance(spec['options'], dict):
+        raise ValueError("'options' deve ser um objeto")
+    spec['options'] = _checked_options(spec['options'], JOB_OPTIONS.get(spec['solver'], {}), spec['solver'])
+    if spec['n'] < 1 or spec['height'] < 1 or not 0 <= spec['start_idx'] < spec['n'] * spec['height']:
+        raise ValueError(f"Casa inicial {spec['start_idx']} fora do tabuleiro {spec['n']}x{spec['height']}")
+    return spec
+
+def job_key(spec):
+    """Jobs com a mesma chave dão o mesmo resultado (a menos de aleatoriedade sem semente)."""
+    return json.dumps([spec[f] for f in JOB_FIELDS], sort_keys=True)
+
+def _run_job(spec):
+    """Roda no processo do pool."""
+    return solve(spec['solver'], spec['n'], spec['start_idx'], seed=spec['seed'], time_limit=spec['time_limit'],
+                 generations=spec['generations'], closed=spec['closed'], height=spec['height'], **spec['options'])
+
+def _worker_main(conn):
+    """Laço do processo de um _JobProcess: recebe specs pelo pipe e devolve (ok, resultado)."""
+    while True:
+        try:
+            spec = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, _run_job(spec)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+class _JobProcess:
+    """Processo dedicado que roda um job por vez. Se o job passa do prazo, o processo é morto
+       e trocado por um novo (um ProcessPoolExecutor não permite matar um worker só).
+       O processo não é daemon, porque o solver 'islands' cria os próprios processos; quem o
+       encerra é close() (o JobScheduler garante a chamada também na saída do interpretador)."""
+    def __init__(self):
+        self.closed = False
+        self._spawn()
+
+    def _spawn(self):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main, args=(child,))
+        self.process.start()
+        child.close()
+
+    def _kill(self):
+        self.process.kill(); self.process.join(); self.conn.close()
+
+    def recycle(self):
+        self._kill()
+        if not self.closed:   # close() no meio de um job: não repõe o processo
+            self._spawn()
+
+    def run(self, spec, timeout):
+        """Resultado do job; TimeoutError se passar de 'timeout' segundos. Qualquer falha depois
+           do envio recicla o processo, para que uma resposta atrasada nunca seja lida como a
+           do job seguinte."""
+        try:
+            self.conn.send(spec)
+            if not self.conn.poll(timeout):
+                raise TimeoutError(f"job passou de {timeout:g}s e foi interrompido")
+            ok, value = self.conn.recv()
+        except EOFError:
+            self.recycle()
+            raise RuntimeError("o processo do job terminou sem resposta") from None
+        except BaseException:
+            self.recycle()
+            raise
+        if not ok: raise RuntimeError(value)
+        return value
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._kill()
+
+def _close_processes(procs):
+    for proc in procs: proc.close()
+
+# ----------------------------
+# Escalonador
+# ----------------------------
+class JobScheduler:
+    """Fila de prioridade (maior 'priority' primeiro; empate = ordem de chegada) atendida por
+       'workers' processos dedicados. Um job idêntico a outro ainda na fila ou em execução
+       recebe o mesmo id (e, se vier com prioridade maior, promove o original). O time_limit
+       de cada job é limitado a max_time e repassado ao solver; como nem todo solver o
+       respeita (warnsdorff, divide), o job que passa de time_limit + JOB_GRACE tem o
+       processo morto e reciclado e termina em 'error' com 'timeout'. Os solvers
+       determinísticos consultam o TourCache (se houver) antes de ir para a fila."""
+    def __init__(self, workers=None, cache=None, max_time=MAX_TIME_LIMIT):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.max_time = max_time
+        self._procs = [_JobProcess() for _ in range(self.workers)]
+        # os processos não são daemon: sem close(), a saída do interpretador esperaria por eles
+        self._reaper = weakref.finalize(self, _close_processes, self._procs)
+        self._lock = threading.Condition()
+        self._heap = []                # (-prioridade, seq, id)
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self.jobs = {}                 # id -> {'spec', 'priority', 'state', 'result', 'error', ...}
+        self._inflight = {}            # chave -> id (fila ou execução)
+        self.running = 0
+        self.deduped = 0
+        self.timeouts = 0
+        self._closed = False
+        self._threads = [threading.Thread(target=self._serve, args=(proc,), daemon=True) for proc in self._procs]
+        for t in self._threads: t.start()
+
+    def submit(self, job):
+        """Enfileira um job (dict) e retorna o id; jobs inválidos retornam um id já em estado 'error'."""
+        priority = 0
+        with self._lock:
+            try:
+                spec = normalize_job(job)
+                priority = int(job.get('priority', 0))
+                spec['time_limit'] = min(spec['time_limit'], self.max_time)
+            except (TypeError, ValueError, OverflowError) as e:
+                job_id = next(self._ids)
+                now = time.time()
+                self.jobs[job_id] = {'spec': job, 'priority': priority, 'state': 'error', 'error': str(e),
+                                     'submitted': now, 'finished': now}
+                self._lock.notify_all()
+                return job_id
+            key = job_key(spec)
+            if key in self._inflight:
+                job_id = self._inflight[key]; entry = self.jobs[job_id]
+                self.deduped += 1
+                if entry['state'] == 'queued' and priority > entry['priority']:
+                    entry['priority'] = priority
+                    heapq.heappush(self._heap, (-priority, next(self._seq), job_id))  # a entrada antiga é ignorada
+                return job_id
+            job_id = next(self._ids)
+            self.jobs[job_id] = {'spec': spec, 'key': key, 'priority': priority, 'state': 'queued', 'submitted': time.time()}
+            if self.cache is not None and spec['solver'] in CACHED_SOLVERS:
+                path = self.cache.get(spec['n'], spec['height'], spec['start_idx'], closed=spec['closed'])
+                if path is not None:
+                    self._finish(job_id, {'solver': spec['solver'], 'n': spec['n'], 'height': spec['height'],
+                                          'start_idx': spec['start_idx'],
+                                          'seed': spec['seed'], 'cached': True, 'elapsed': 0.0, 'complete': True,
+                                          'length': len(path), 'path': path})
+                    return job_id
+            self._inflight[key] = job_id
+            heapq.heappush(self._heap, (-priority, next(self._seq), job_id))
+            self._lock.notify_all()
+            return job_id
+
+    def _serve(self, proc):
+        """Thread de um processo: tira o próximo job da fila, roda com prazo e registra o fim."""
+        while True:
+            with self._lock:
+                while not self._closed and not self._heap:
+                    self._lock.wait()
+                if self._closed: return
+                _, _, job_id = heapq.heappop(self._heap)
+                entry = self.jobs[job_id]
+                if entry['state'] != 'queued': continue   # entrada antiga de um job promovido
+                entry['state'] = 'running'; entry['started'] = time.time(); self.running += 1
+            try:
+                result = proc.run(entry['spec'], entry['spec']['time_limit'] + JOB_GRACE)
+            except Exception as e:
+                if self._closed: return
+                self._done(job_id, error=e)
+            else:
+                self._done(job_id, result)
+
+    def _done(self, job_id, result=None, error=None):
+        with self._lock:
+            self.running -= 1
+            entry = self.jobs[job_id]
+            self._inflight.pop(entry['key'], None)
+            if isinstance(error, TimeoutError):
+                self.timeouts += 1
+                entry.update(state='error', error=f"timeout: {error}", timeout=True, finished=time.time())
+            elif error is not None:
+                entry.update(state='error', error=f"{type(error).__name__}: {error}", finished=time.time())
+            else:
+                violation = tour_violation(result['path'], result['n'], result['height'],
+                                           closed=result.get('closed', False),
+                                           complete=result['complete']) if result['path'] else None
+                if violation:
+                    result['violation'] = violation
+                self._finish(job_id, result)
+                if self.cache is not None and result['complete'] and not violation:
+                    self.cache.put(result['n'], result['height'], result['path'])
+            self._lock.notify_all()
+
+    def _finish(self, job_id, result):
+        self.jobs[job_id].update(state='done', result=result, finished=time.time())
+        self._lock.notify_all()
+
+    def record(self, job_id, include_path=True):
+        """Estado serializável de um job."""
+        entry = self.jobs[job_id]
+        rec = {'job_id': job_id, 'state': entry['state'], 'priority': entry['priority']}
+        if entry['state'] == 'done':
+            rec['result'] = entry['result'] if include_path else {k: v for k, v in entry['result'].items() if k != 'path'}
+        elif entry['state'] == 'error':
+            rec['error'] = entry['error']
+            if entry.get('timeout'): rec['timeout'] = True
+        return rec
+
+    def results(self, job_ids, include_path=True, timeout=None):
+        """Gera o registro de cada job assim que ele termina (ordem de término; ids repetidos saem uma vez)."""
+        pending = set(job_ids)
+        deadline = None if timeout is None else time.time() + timeout
+        while pending:
+            with self._lock:
+                ready = [i for i in pending if self.jobs[i]['state'] in ('done', 'error')]
+                if not ready:
+                    left = None if deadline is None else deadline - time.time()
+                    if left is not None and left <= 0: return
+                    self._lock.wait(left)
+                    continue
+                records = [self.record(i, include_path) for i in sorted(ready, key=lambda i: self.jobs[i]['finished'])]
+                pending.difference_update(ready)
+            yield from records
+
+    def status(self):
+        with self._lock:
+            states = {}
+            for entry in self.jobs.values(): states[entry['state']] = states.get(entry['state'], 0) + 1
+            return {'workers': self.workers, 'queued': states.get('queued', 0), 'running': self.running,
+                    'done': states.get('done', 0), 'errors': states.get('error', 0), 'timeouts': self.timeouts,
+                    'deduped': self.deduped, 'max_time': self.max_time}
+
+    def close(self):
+        with self._lock:
+            self._closed = True; self._lock.notify_all()
+        self._reaper()
+
+# ----------------------------
+# Servidor HTTP
+# ----------------------------
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    scheduler = None   # definido por make_server
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, obj, status=200):
+        body = (json.dumps(obj) + "\n").encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json"); self.send_header("Content-Length", str(len(body)))
+        self.end_headers(); self.wfile.write(body)
+
+    def _chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n"); self.wfile.flush()
+
+    def do_GET(self):
+        url = urlparse(self.path); parts = url.path.strip("/").split("/")
+        if parts == ["status"]:
+            return self._send_json(self.scheduler.status())
+        if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit() and int(parts[1]) in self.scheduler.jobs:
+            include_path = parse_qs(url.query).get("path", ["1"])[0] != "0"
+            return self._send_json(self.scheduler.record(int(parts[1]), include_path))
+        self._send_json({'error': 'não encontrado'}, 404)
+
+    def do_POST(self):
+        url = urlparse(self.path); query = parse_qs(url.query)
+        if url.path.rstrip("/") != "/jobs":
+            return self._send_json({'error': 'não encontrado'}, 404)
+        # Só JSON: formulários de uma página qualquer no navegador não conseguem mandar este
+        # Content-Type para outra origem sem um preflight, que este servidor não atende
+        if self.headers.get("Content-Type", "").split(";")[0].strip().lower() != "application/json":
+            return self._send_json({'error': "Content-Type deve ser application/json"}, 415)
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            jobs = payload["jobs"] if isinstance(payload, dict) else payload
+            if not isinstance(jobs, list): raise ValueError("'jobs' deve ser uma lista")
+        except (ValueError, KeyError) as e:
+            return self._send_json({'error': f"pedido inválido: {e}"}, 400)
+        ids = [self.scheduler.submit(job) for job in jobs]
+        if query.get("wait", ["1"])[0] == "0":
+            return self._send_json({'accepted': ids})
+        include_path = query.get("path", ["1"])[0] != "0"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson"); self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            self._chunk({'accepted': ids})
+            for rec in self.scheduler.results(ids, include_path):
+                self._chunk(rec)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # o cliente desistiu; os jobs continuam e ficam consultáveis por GET /jobs/<id>
+
+def make_server(host=SERVICE_HOST, port=SERVICE_PORT, workers=None, cache=None, max_time=MAX_TIME_LIMIT):
+    """Servidor pronto para serve_forever(); server.scheduler dá acesso ao escalonador."""
+    scheduler = JobScheduler(workers, cache, max_time)
+    handler = type("Handler", (_Handler,), {'scheduler': scheduler})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.scheduler = scheduler
+    return server
+
+# ----------------------------
+# Cliente
+# ----------------------------
+class SolveClient:
+    """Cliente do serviço (só biblioteca padrão)."""
+    def __init__(self, host=SERVICE_HOST, port=SERVICE_PORT, timeout=None):
+        self.host, self.port, self.timeout = host, port, timeout
+
+    def _request(self, method, path, body=None):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        conn.request(method, path, body=None if body is None else json.dumps(body),
+                     headers={"Content-Type": "application/json"})
+        return conn, conn.getresponse()
+
+    def _get(self, path):
+        conn, resp = self._request("GET", path)
+        try:
+            data = json.loads(resp.read())
+            if resp.status != 200: raise RuntimeError(data.get('error', resp.reason))
+            return data
+        finally:
+            conn.close()
+
+    def submit(self, jobs, include_path=True):
+        """Envia um lote e gera os registros à medida que os jobs terminam; o primeiro item é
+           {'accepted': [ids]} (jobs repetidos podem compartilhar o mesmo id)."""
+        conn, resp = self._request("POST", "/jobs" + ("" if include_path else "?path=0"), {'jobs': list(jobs)})
+        try:
+            if resp.status != 200: raise RuntimeError(json.loads(resp.read()).get('error', resp.reason))
+            for line in resp:
+                if line.strip(): yield json.loads(line)
+        finally:
+            conn.close()
+
+    def enqueue(self, jobs):
+        """Só enfileira; retorna os ids."""
+        conn, resp = self._request("POST", "/jobs?wait=0", {'jobs': list(jobs)})
+        try:
+            return json.loads(resp.read())['accepted']
+        finally:
+            conn.close()
+
+    def job(self, job_id, include_path=True):
+        return self._get(f"/jobs/{job_id}" + ("" if include_path else "?path=0"))
+
+    def status(self):
+        return self._get("/status")
+
+# ----------------------------
+# Linha de comando
+# ----------------------------
+def _int_list(text):
+    values = []
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        values.extend(range(int(lo), int(hi or lo) + 1))
+    return values
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serviço local de resolução em lote do Passeio do Cavalo.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="inicia o servidor")
+    serve.add_argument("--workers", type=int, default=None, help="processos do pool (padrão: núcleos)")
+    serve.add_argument("--max-time", type=float, default=MAX_TIME_LIMIT,
+                       help="teto do time_limit por job (s); o job é interrompido após teto + folga")
+    serve.add_argument("--cache", nargs="?", const=TOUR_CACHE_PATH, default=None, metavar="ARQUIVO",
+                       help="consulta/grava passeios num TourCache")
+    submit = sub.add_parser("submit", help="envia um lote e imprime os resultados (JSON Lines)")
+    submit.add_argument("--solver", choices=SOLVERS, default="warnsdorff")
+    submit.add_argument("--sizes", type=_int_list, default=[BOARD_SIZE], help="ex.: 5-8 ou 6,8,12")
+    submit.add_argument("--height", type=int, default=None, help="altura fixa (tabuleiros --sizes x --height)")
+    submit.add_argument("--starts", default="0", help="'all', 'canonical' ou lista de casas (ex.: 0,27)")
+    submit.add_argument("--seed", type=int, default=None)
+    submit.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT, help="orçamento por job (s)")
+    submit.add_argument("--generations", type=int, default=GA_GEN_LIMIT)
+    submit.add_argument("--closed", action="store_true")
+    submit.add_argument("--priority", type=int, default=0, help="maior = antes")
+    submit.add_argument("--no-path", action="store_true", help="omite os caminhos na resposta")
+    sub.add_parser("status", help="estado da fila")
+    return parser
+
+def _batch(args):
+    for n in args.sizes:
+        h = args.height or n
+        if args.starts == "all": starts = range(n * h)
+        elif args.starts == "canonical": starts = canonical_starts(n, h)
+        else: starts = [s for s in _int_list(args.starts) if s < n * h]
+        for s in starts:
+            yield {'solver': args.solver, 'n': n, 'height': h, 'start_idx': s, 'seed': args.seed,
+                   'time_limit': args.time_limit, 'generations': args.generations, 'closed': args.closed,
+                   'priority': args.priority}
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        server = make_server(args.host, args.port, args.workers, TourCache(args.cache) if args.cache else None,
+                             args.max_time)
+        print(f"Servindo em http://{args.host}:{args.port} com {server.scheduler.workers} processos", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close(); server.scheduler.close()
+        return 0
+    client = SolveClient(args.host, args.port)
+    if args.command == "status":
+        print(json.dumps(client.status()))
+        return 0
+    for rec in client.submit(_batch(args), include_path=not args.no_path):
+        print(json.dumps(rec), flush=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
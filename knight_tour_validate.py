@@ -0,0 +1,255 @@
+"""
+knight_tour_validate.py
+Verificação de passeios: completude, casas repetidas, casas fora do tabuleiro, legalidade
+dos saltos e fechamento, para um passeio ou um lote inteiro, sempre apontando a primeira
+violação. Com numpy o lote vira uma matriz (um passeio por linha) e cada verificação é uma
+operação vetorizada sobre a matriz inteira; sem numpy há um laço em Python com o mesmo
+relatório. Como programa, confere em massa os JSON Lines do CLI/serviço (caminhos em lista
+ou compactos, --compact) e os passeios guardados num TourCache.
+
+Exemplos:
+    python knight_tour_validate.py resultados.jsonl
+    python knight_tour_cli.py --solver warnsdorff --size 8 --all-starts | python knight_tour_validate.py -
+    python knight_tour_validate.py --cache
+"""
+import argparse
+import base64
+import json
+import sqlite3
+import sys
+import time
+
+from knight_tour import KNIGHT_MOVES, decode_moves
+from knight_tour_cache import TOUR_CACHE_PATH
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+VIOLATIONS = ('length', 'range', 'repeat', 'move', 'closed')
+BATCH_CELLS = 1 << 22  # casas por bloco de verificação (~16 MB em int32)
+
+# ----------------------------
+# Relatório
+# ----------------------------
+def _report(kind, index, path, w, h):
+    """Dicionário da violação 'kind' na posição 'index' do caminho."""
+    if kind == 'length':
+        msg = "caminho vazio" if not len(path) else f"passeio com {len(path)} casas, esperado {w * h}"
+    elif kind == 'range':
+        msg = f"casa {path[index]} fora do tabuleiro {w}x{h} na posição {index}"
+    elif kind == 'repeat':
+        msg = f"casa {path[index]} repetida na posição {index}"
+    elif kind == 'move':
+        msg = f"salto ilegal {path[index-1]} -> {path[index]} na posição {index}"
+    else:
+        msg = f"a última casa {path[-1]} não volta à inicial {path[0]}"
+    return {'kind': kind, 'index': int(index), 'message': msg}
+
+def _scalar_violation(path, w, h, closed, complete):
+    n2 = w * h
+    if not len(path) or (complete and len(path) != n2):
+        return 'length', len(path)
+    seen = set(); prev = None
+    for i, sq in enumerate(path):
+        if not 0 <= sq < n2: return 'range', i
+        if sq in seen: return 'repeat', i
+        if prev is not None and abs(sq % w - prev % w) * abs(sq // w - prev // w) != 2: return 'move', i
+        seen.add(sq); prev = sq
+    a, b = path[-1], path[0]
+    if closed and abs(a % w - b % w) * abs(a // w - b // w) != 2:
+        return 'closed', 0
+    return None
+
+# ----------------------------
+# Verificação vetorizada
+# ----------------------------
+def batch_violations(tours, w, h=None, closed=False, complete=True):
+    """Primeira violação de cada passeio de um lote de caminhos do mesmo tamanho (matriz k x L
+       ou lista de listas). Retorna (tipos, posições): tipos[i] é o índice em VIOLATIONS
+       (-1 = válido) e posições[i] a posição da violação no caminho i. Entre violações na
+       mesma posição vale a ordem range, repeat, move; 'closed' só conta se não houver outra.
+       complete=False aceita caminhos parciais (só exige casas distintas e saltos legais)."""
+    h = w if h is None else h
+    n2 = w * h
+    if not NUMPY_AVAILABLE:
+        found = [_scalar_violation(list(p), w, h, closed, complete) for p in tours]
+        return ([-1 if v is None else VIOLATIONS.index(v[0]) for v in found],
+                [0 if v is None else v[1] for v in found])
+    mat = np.asarray(tours, dtype=np.int64 if n2 > np.iinfo(np.int32).max else np.int32)
+    if mat.ndim != 2: mat = mat.reshape(len(mat), -1)
+    k, L = mat.shape
+    if L == 0 or (complete and L != n2):
+        return np.zeros(k, np.int8), np.full(k, L)
+    none = np.int64(L)
+    def first(bad, offset=0):
+        if not bad.shape[1]: return np.full(k, none)
+        return np.where(bad.any(axis=1), bad.argmax(axis=1) + offset, none)
+    out = (mat < 0) | (mat >= n2)
+    # casas fora do tabuleiro já foram apontadas; int16 deixa a ordenação bem mais rápida
+    cells = np.where(out, 0, mat).astype(np.int16 if n2 <= np.iinfo(np.int16).max else mat.dtype)
+    # Repetidas: a ordenação simples só diz quais linhas têm repetição; para essas (raras), a
+    # ordenação estável dá a posição: entre iguais, a ocorrência posterior é a repetida
+    srt = np.sort(cells, axis=1)
+    rows = np.flatnonzero((srt[:, 1:] == srt[:, :-1]).any(axis=1))
+    repeat = np.full(k, none)
+    if len(rows):
+        order = np.argsort(cells[rows], axis=1, kind='stable')
+        srt = np.take_along_axis(cells[rows], order, axis=1)
+        repeat[rows] = np.where(srt[:, 1:] == srt[:, :-1], order[:, 1:], none).min(axis=1)
+    squares = np.arange(n2)
+    xs, ys = (squares % w).astype(cells.dtype)[cells], (squares // w).astype(cells.dtype)[cells]
+    legal = np.abs(np.diff(xs, axis=1)) * np.abs(np.diff(ys, axis=1)) == 2
+    pos = np.stack([first(out), repeat, first(~legal, 1)])
+    rank = np.argmin(pos * 3 + np.arange(3)[:, None], axis=0)
+    where = pos[rank, np.arange(k)]
+    kinds = np.where(where < L, rank + 1, -1).astype(np.int8)
+    if closed:
+        ret = np.abs(xs[:, -1] - xs[:, 0]).astype(np.int64) * np.abs(ys[:, -1] - ys[:, 0]) != 2
+        kinds[(kinds < 0) & ret] = VIOLATIONS.index('closed')
+        where = np.where(kinds == VIOLATIONS.index('closed'), 0, where)
+    return kinds, where
+
+def tour_violation(path, w, h=None, closed=False, complete=True):
+    """Primeira violação de um caminho ({'kind', 'index', 'message'}) ou None se ele for válido.
+       complete=False aceita caminhos parciais (ex.: o melhor indivíduo de um GA sem solução)."""
+    h = w if h is None else h
+    if NUMPY_AVAILABLE and len(path):
+        kinds, where = batch_violations([path], w, h, closed, complete)
+        found = None if kinds[0] < 0 else (VIOLATIONS[kinds[0]], where[0])
+    else:
+        found = _scalar_violation(path, w, h, closed, complete)
+    return None if found is None else _report(*found, path, w, h)
+
+def decode_moves_batch(starts, blobs, count, w):
+    """decode_moves para um lote de passeios com o mesmo número de saltos: matriz k x (count+1)."""
+    if not NUMPY_AVAILABLE:
+        return [decode_moves(s, b, count, w) for s, b in zip(starts, blobs)]
+    if count == 0:
+        return np.asarray(starts, dtype=np.int64).reshape(-1, 1)
+    raw = np.frombuffer(b''.join(blobs), dtype=np.uint8).reshape(len(blobs), -1, 3).astype(np.int32)
+    words = raw[..., 0] | raw[..., 1] << 8 | raw[..., 2] << 16
+    codes = (words[..., None] >> np.arange(0, 24, 3)) & 7
+    steps = np.array([dy * w + dx for dx, dy in KNIGHT_MOVES])
+    path = np.empty((len(blobs), count + 1), dtype=np.int64)
+    path[:, 0] = starts
+    path[:, 1:] = steps[codes.reshape(len(blobs), -1)[:, :count]]
+    return np.cumsum(path, axis=1)
+
+# ----------------------------
+# Verificação em massa
+# ----------------------------
+class BulkVerifier:
+    """Agrupa passeios por (largura, altura, tamanho, fechado, completo) e verifica cada grupo
+       com batch_violations quando ele enche um bloco de BATCH_CELLS casas."""
+    def __init__(self, on_violation=None):
+        self.on_violation = on_violation
+        self.checked = self.invalid = 0
+        self._groups = {}
+
+    def add(self, source, path, w, h=None, closed=False, complete=True):
+        self._push((w, w if h is None else h, len(path), bool(closed), bool(complete), False), source, path)
+
+    def add_packed(self, source, start, moves, length, w, h=None, closed=False, complete=True):
+        """Passeio compacto (encode_moves); grupos do mesmo tamanho são decodificados juntos."""
+        if length < 1 or len(moves) != (length + 6) // 8 * 3:
+            self.checked += 1; self.invalid += 1
+            if self.on_violation:
+                self.on_violation(source, {'kind': 'length', 'index': 0,
+                                           'message': f"{len(moves)} bytes de saltos para {length} casas"})
+            return
+        self._push((w, w if h is None else h, length, bool(closed), bool(complete), True), source, (start, bytes(moves)))
+
+    def _push(self, key, source, item):
+        sources, items = self._groups.setdefault(key, ([], []))
+        sources.append(source); items.append(item)
+        if len(items) * max(1, key[2]) >= BATCH_CELLS: self._flush(key)
+
+    def _flush(self, key):
+        sources, items = self._groups.pop(key)
+        w, h, length, closed, complete, packed = key
+        paths = decode_moves_batch([s for s, _ in items], [m for _, m in items], length - 1, w) if packed else items
+        self.checked += len(sources)
+        kinds, where = batch_violations(paths, w, h, closed, complete)
+        for i in (np.flatnonzero(np.asarray(kinds) >= 0) if NUMPY_AVAILABLE else
+                  [i for i, kind in enumerate(kinds) if kind >= 0]):
+            self.invalid += 1
+            if self.on_violation:
+                self.on_violation(sources[i], _report(VIOLATIONS[kinds[i]], where[i], list(paths[i]), w, h))
+
+    def finish(self):
+        for key in list(self._groups): self._flush(key)
+        return self.checked, self.invalid
+
+def _records(stream):
+    """(número da linha, resultado) de um JSON Lines do CLI ou do serviço (desembrulha 'result')."""
+    for lineno, line in enumerate(stream, 1):
+        if line.strip():
+            rec = json.loads(line)
+            yield lineno, rec.get('result', rec)
+
+def verify_stream(verifier, stream, name):
+    """Enfileira no verificador cada passeio do arquivo. Retorna (sem caminho, sem solução):
+       registros gravados com --no-path e registros "nenhum passeio encontrado" (complete
+       false e caminho vazio, como divide numa casa sem passeio), que não são violações."""
+    skipped = unsolved = 0
+    for lineno, rec in _records(stream):
+        w = rec.get('n'); h = rec.get('height') or w
+        closed, complete = rec.get('closed', False), rec.get('complete', True)
+        if w is None or ('path' not in rec and 'moves' not in rec):
+            skipped += 1
+        elif not complete and not (rec['path'] if 'path' in rec else rec.get('path_len')):
+            unsolved += 1
+        elif 'moves' in rec:
+            verifier.add_packed(f"{name}:{lineno}", rec['path_start'], base64.b64decode(rec['moves']),
+                                rec['path_len'], w, h, closed, complete)
+        else:
+            verifier.add(f"{name}:{lineno}", rec['path'], w, h, closed, complete)
+    return skipped, unsolved
+
+def verify_cache(verifier, path):
+    """Enfileira todos os passeios guardados num TourCache (lidos direto do SQLite, sem o LRU)."""
+    db = sqlite3.connect(path)
+    try:
+        for w, h, start, closed, length, moves in db.execute("SELECT width, height, start, closed, length, moves FROM tours"):
+            verifier.add_packed(f"{path}:{w}x{h}:{start}", start, moves, length, w, h, closed=bool(closed))
+    finally:
+        db.close()
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Confere passeios do cavalo em massa (JSON Lines ou TourCache).")
+    parser.add_argument("files", nargs="*", help="arquivos JSON Lines do CLI/serviço ('-' = stdin)")
+    parser.add_argument("--cache", nargs="?", const=TOUR_CACHE_PATH, default=None, metavar="ARQUIVO",
+                        help="confere também os passeios de um TourCache")
+    parser.add_argument("--quiet", "-q", action="store_true", help="só o resumo, sem uma linha por violação")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.files and not args.cache:
+        parser.error("informe arquivos JSON Lines e/ou --cache")
+    def report(source, violation):
+        if not args.quiet: print(json.dumps({'source': source, **violation}), flush=True)
+    verifier = BulkVerifier(report)
+    start = time.perf_counter(); skipped = unsolved = 0
+    for name in args.files:
+        if name == "-":
+            counts = verify_stream(verifier, sys.stdin, "<stdin>")
+        else:
+            with open(name, encoding="utf-8") as f:
+                counts = verify_stream(verifier, f, name)
+        skipped += counts[0]; unsolved += counts[1]
+    if args.cache:
+        verify_cache(verifier, args.cache)
+    checked, invalid = verifier.finish()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'checked': checked, 'invalid': invalid, 'skipped': skipped, 'unsolved': unsolved,
+                      'elapsed': round(elapsed, 3),
+                      'tours_per_sec': round(checked / elapsed) if elapsed > 0 else None}), file=sys.stderr)
+    return 1 if invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())